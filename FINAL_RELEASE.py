@@ -1,19 +1,79 @@
 """
 FINAL RELEASE VALIDATION
 Complete debugging, testing, pentesting, and code review
+
+Only hash_chain is imported up front (a failure is reported by the syntax
+phase); api/data_ingestion/main are compiled but never executed.
+Profile startup with: python -X importtime FINAL_RELEASE.py
 """
 
 import sys
+import io
 import time
 import json
+import argparse
+import importlib
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 
-# Color codes for output
-GREEN = '\033[92m'
-RED = '\033[91m'
-YELLOW = '\033[93m'
-BLUE = '\033[94m'
-RESET = '\033[0m'
+# A broken hash_chain must not crash the validator before it can report:
+# phase_syntax compiles and imports it again and records the failure, and
+# the tests that need these names then fail individually.
+try:
+    from hash_chain import (
+        LLMSummaryGenerator, Amendment, ChainNode, HashChain, RateLimiter, AuditLog
+    )
+except Exception:
+    pass
+
+try:
+    import orjson  # Optional: faster JSON encoding
+except ImportError:
+    orjson = None
+
+# Color codes for output (disabled when piped, e.g. into CI logs)
+USE_COLOR = sys.stdout.isatty()
+GREEN = '\033[92m' if USE_COLOR else ''
+RED = '\033[91m' if USE_COLOR else ''
+YELLOW = '\033[93m' if USE_COLOR else ''
+BLUE = '\033[94m' if USE_COLOR else ''
+RESET = '\033[0m' if USE_COLOR else ''
+
+# CLI phase name -> ReleaseValidator method
+PHASES = {
+    'syntax': 'phase_syntax',
+    'unit': 'phase_unit_tests',
+    'security': 'phase_security',
+    'performance': 'phase_performance',
+    'integration': 'phase_integration',
+    'code_review': 'phase_code_review',
+}
+
+# Project modules -> phases that execute them. Modules no phase needs are
+# only compiled, so FastAPI/pydantic never load during validation.
+MODULE_PHASES = {
+    'hash_chain': ['unit', 'security', 'performance', 'integration'],
+    'data_ingestion': [],
+    'api': [],
+    'main': [],
+}
+
+# (payload, attack name) pairs for the injection test. "\u0000" is the
+# same string as "\x00", so the null byte case is only listed once.
+INJECTION_PAYLOADS = (
+    ("'; DROP TABLE amendments; --", "SQL injection"),
+    ("<script>alert('XSS')</script>", "XSS attack"),
+    ("Content\x00Injection", "Null byte"),
+)
+
+# Phases that build their own fixtures and can run in separate worker processes
+PARALLEL_PHASES = [
+    'phase_unit_tests',
+    'phase_security',
+    'phase_performance',
+    'phase_integration',
+]
 
 class ReleaseValidator:
     """Master validation suite for production release"""
@@ -28,44 +88,79 @@ class ReleaseValidator:
             'code_review': []
         }
         self.start_time = time.time()
+        self._buf = io.StringIO()
+    
+    def _write(self, line: str = ""):
+        """Buffer one line of output (flushed once per phase)"""
+        self._buf.write(line + "\n")
+    
+    def _flush(self):
+        """Write buffered output to stdout in a single call"""
+        sys.stdout.write(self._buf.getvalue())
+        sys.stdout.flush()
+        self._buf = io.StringIO()
     
     def print_header(self, text: str):
-        print(f"\n{BLUE}{'='*80}{RESET}")
-        print(f"{BLUE}{text.center(80)}{RESET}")
-        print(f"{BLUE}{'='*80}{RESET}\n")
+        self._write(f"\n{BLUE}{'='*80}{RESET}")
+        self._write(f"{BLUE}{text.center(80)}{RESET}")
+        self._write(f"{BLUE}{'='*80}{RESET}\n")
     
     def print_test(self, category: str, name: str, passed: bool, msg: str = ""):
         status = f"{GREEN}✓ PASS{RESET}" if passed else f"{RED}✗ FAIL{RESET}"
-        print(f"  {status}  {name}")
+        self._write(f"  {status}  {name}")
         if msg:
-            print(f"         {msg}")
+            self._write(f"         {msg}")
         self.results[category].append({'name': name, 'passed': passed, 'msg': msg})
     
-    def run_all(self):
-        """Run complete validation suite"""
+    def run_all(self, jobs: int = None, phases: list = None, threads: bool = False):
+        """Run complete validation suite
+        
+        Args:
+            jobs: Workers for the independent phases (1 = serial,
+                  None = one per CPU core)
+            phases: Subset of PHASES keys to run (default: all)
+            threads: Use threads in this process instead of worker processes
+        """
         self.print_header("FINAL RELEASE VALIDATION SUITE")
+        self._flush()
+        selected = [PHASES[name] for name in (phases or PHASES)]
         
         # Phase 1: Syntax & Imports
-        self.phase_syntax()
-        
-        # Phase 2: Unit Tests
-        self.phase_unit_tests()
-        
-        # Phase 3: Security & Pentesting
-        self.phase_security()
-        
-        # Phase 4: Performance
-        self.phase_performance()
-        
-        # Phase 5: Integration
-        self.phase_integration()
+        if 'phase_syntax' in selected:
+            self.phase_syntax()
+            self._flush()
+        
+        # Phases 2-5: Unit, Security, Performance, Integration
+        independent = [p for p in PARALLEL_PHASES if p in selected]
+        if jobs == 1 or len(independent) <= 1:
+            for phase in independent:
+                getattr(self, phase)()
+                self._flush()
+        else:
+            self.run_parallel(independent, jobs, threads)
         
         # Phase 6: Code Review
-        self.phase_code_review()
+        if 'phase_code_review' in selected:
+            self.phase_code_review()
+            self._flush()
         
         # Summary
         self.print_summary()
     
+    def run_parallel(self, phases: list, jobs: int = None, threads: bool = False):
+        """Run independent phases concurrently, one worker each
+        
+        Each phase gets its own validator, so threads share no results or
+        buffers; hashlib releases the GIL while hashing.
+        """
+        executor = ThreadPoolExecutor if threads else ProcessPoolExecutor
+        with executor(max_workers=jobs) as pool:
+            # map() preserves phase order, so output reads as if run serially
+            for output, results in pool.map(_run_phase_isolated, phases):
+                sys.stdout.write(output)
+                for category, tests in results.items():
+                    self.results[category].extend(tests)
+    
     # ========================================================================
     # PHASE 1: SYNTAX & IMPORTS
     # ========================================================================
@@ -74,19 +169,27 @@ class ReleaseValidator:
         """Validate syntax and imports"""
         self.print_header("PHASE 1: SYNTAX & IMPORT VALIDATION")
         
-        modules = ['hash_chain', 'data_ingestion', 'api', 'main']
-        
-        for module in modules:
+        for module, phases in MODULE_PHASES.items():
+            # Compile every module's source without executing it; only
+            # import what a phase will execute anyway
+            name = f"Import {module}.py" if phases else f"Compile {module}.py"
             try:
-                __import__(module)
-                self.print_test('syntax', f"Import {module}.py", True)
+                spec = importlib.util.find_spec(module)
+                if spec is None or not spec.origin:
+                    raise ImportError(f"No module named '{module}'")
+                with open(spec.origin, 'rb') as f:
+                    compile(f.read(), spec.origin, 'exec')
+                if phases:
+                    importlib.import_module(module)
+                self.print_test('syntax', name, True)
             except SyntaxError as e:
-                self.print_test('syntax', f"Import {module}.py", False, f"Syntax error: {e}")
+                self.print_test('syntax', name, False, f"Syntax error: {e}")
+                self._flush()
                 sys.exit(1)
             except ImportError as e:
-                self.print_test('syntax', f"Import {module}.py", False, f"Import error: {e}")
+                self.print_test('syntax', name, False, f"Import error: {e}")
             except Exception as e:
-                self.print_test('syntax', f"Import {module}.py", False, f"Error: {e}")
+                self.print_test('syntax', name, False, f"Error: {e}")
         
         # Check for unused imports
         self.print_test('syntax', "Unused imports check", True, "Manual review required")
@@ -99,10 +202,6 @@ class ReleaseValidator:
         """Run unit tests"""
         self.print_header("PHASE 2: UNIT TESTS")
         
-        from hash_chain import (
-            LLMSummaryGenerator, Amendment, ChainNode, HashChain, RateLimiter
-        )
-        
         # Test 2.1: LLMSummaryGenerator
         try:
             llm = LLMSummaryGenerator()
@@ -204,18 +303,9 @@ class ReleaseValidator:
         """Security and penetration testing"""
         self.print_header("PHASE 3: SECURITY & PENETRATION TESTING")
         
-        from hash_chain import Amendment, HashChain, LLMSummaryGenerator, RateLimiter
-        
         # Test 3.1: Input injection attacks
         try:
-            injection_tests = [
-                ("'; DROP TABLE amendments; --", "SQL injection"),
-                ("<script>alert('XSS')</script>", "XSS attack"),
-                ("Content\x00Injection", "Null byte"),
-                ("Content\u0000Injection", "Unicode null"),
-            ]
-            
-            for payload, attack_name in injection_tests:
+            for payload, attack_name in INJECTION_PAYLOADS:
                 try:
                     amendment = Amendment(payload, "substantive", "Author")
                     # If it gets here, it's stored safely (not executed)
@@ -236,9 +326,9 @@ class ReleaseValidator:
                 amendment = Amendment(f"Content {i}", "substantive", f"Author {i}")
                 node = ChainNode(amendment)
                 
-                if node.hash in hashes:
+                if node.digest in hashes:
                     collisions += 1
-                hashes.add(node.hash)
+                hashes.add(node.digest)
             
             assert collisions == 0, "Hash collision detected!"
             assert len(hashes) == 100, "All hashes should be unique"
@@ -259,7 +349,7 @@ class ReleaseValidator:
             
             # Tamper with hash
             chain.chain[0].amendment.content = "Original"
-            chain.chain[0].hash = "fake_hash_" + chain.chain[0].hash[10:]
+            chain.chain[0].digest = b"fake_hash_" + chain.chain[0].digest[10:]
             assert not chain.verify_integrity()
             
             self.print_test('security', "Tampering detection", True)
@@ -288,8 +378,6 @@ class ReleaseValidator:
         """Performance testing"""
         self.print_header("PHASE 4: PERFORMANCE TESTING")
         
-        from hash_chain import Amendment, HashChain, LLMSummaryGenerator
-        
         # Test 4.1: Large chain handling
         try:
             chain = HashChain("ACT-PERF", "Performance Test")
@@ -319,11 +407,13 @@ class ReleaseValidator:
             chain = HashChain("ACT-VERIFY", "Verification Test")
             
             for i in range(100):
-                amendment = Amendment(f"Amendment {i}", "substantive", f"Author {i}")
-                chain.add_amendment(amendment)
+                chain.add_amendment(
+                    Amendment(f"Amendment {i}", "substantive", f"Author {i}")
+                )
             
             start = time.time()
-            is_valid = chain.verify_integrity()
+            # deep: re-hash every node rather than trust the verify memo
+            is_valid = chain.verify_integrity(deep=True)
             elapsed = time.time() - start
             
             assert is_valid
@@ -340,9 +430,6 @@ class ReleaseValidator:
         """Integration testing"""
         self.print_header("PHASE 5: INTEGRATION TESTING")
         
-        from hash_chain import Amendment, HashChain, LLMSummaryGenerator
-        import json
-        
         # Test 5.1: End-to-end workflow
         try:
             llm = LLMSummaryGenerator()
@@ -367,7 +454,7 @@ class ReleaseValidator:
             assert chain.verify_integrity()
             
             # Serialize to JSON
-            json_data = json.dumps(history, indent=2)
+            json_data = orjson.dumps(history) if orjson else json.dumps(history)
             assert len(json_data) > 0
             
             self.print_test('integration', "End-to-end workflow", True)
@@ -428,29 +515,51 @@ class ReleaseValidator:
         total_tests = sum(len(tests) for tests in self.results.values())
         elapsed = time.time() - self.start_time
         
-        print(f"{BLUE}Test Results:{RESET}")
+        self._write(f"{BLUE}Test Results:{RESET}")
         for category, tests in self.results.items():
             passed = sum(1 for t in tests if t['passed'])
             total = len(tests)
             percentage = (passed / total * 100) if total > 0 else 0
             status = f"{GREEN}{percentage:.0f}%{RESET}" if passed == total else f"{YELLOW}{percentage:.0f}%{RESET}"
-            print(f"  {category.upper()}: {passed}/{total} passed ({status})")
+            self._write(f"  {category.upper()}: {passed}/{total} passed ({status})")
         
-        print(f"\n{BLUE}Overall:{RESET}")
-        print(f"  Total: {total_passed}/{total_tests} tests passed")
-        print(f"  Time: {elapsed:.2f}s")
-        print(f"  Status: {GREEN}✓ READY FOR PRODUCTION{RESET}" if total_passed == total_tests else f"  Status: {RED}✗ NEEDS FIXES{RESET}")
+        self._write(f"\n{BLUE}Overall:{RESET}")
+        self._write(f"  Total: {total_passed}/{total_tests} tests passed")
+        self._write(f"  Time: {elapsed:.2f}s")
+        self._write(f"  Status: {GREEN}✓ READY FOR PRODUCTION{RESET}" if total_passed == total_tests else f"  Status: {RED}✗ NEEDS FIXES{RESET}")
         
-        print(f"\n{BLUE}{'='*80}{RESET}")
+        self._write(f"\n{BLUE}{'='*80}{RESET}")
         
         if total_passed == total_tests:
-            print(f"{GREEN}✅ APPLICATION IS FULLY FUNCTIONAL AND READY FOR DEPLOYMENT{RESET}")
+            self._write(f"{GREEN}✅ APPLICATION IS FULLY FUNCTIONAL AND READY FOR DEPLOYMENT{RESET}")
+            self._flush()
             sys.exit(0)
         else:
-            print(f"{RED}❌ SOME TESTS FAILED - REVIEW ABOVE{RESET}")
+            self._write(f"{RED}❌ SOME TESTS FAILED - REVIEW ABOVE{RESET}")
+            self._flush()
             sys.exit(1)
 
 
+def _run_phase_isolated(phase: str):
+    """Run one phase on a fresh validator (worker entry point)"""
+    validator = ReleaseValidator()
+    try:
+        getattr(validator, phase)()
+    finally:
+        # Worker processes exit without running atexit hooks
+        AuditLog.flush_all()
+    return validator._buf.getvalue(), validator.results
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Final release validation suite")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="workers for phases 2-5 (default: CPU count, 1 = serial)")
+    parser.add_argument("--threads", action="store_true",
+                        help="run phases 2-5 on threads in this process, not worker processes")
+    parser.add_argument("--phase", action="append", choices=list(PHASES), dest="phases",
+                        help="run only this phase (repeatable)")
+    args = parser.parse_args()
+    
     validator = ReleaseValidator()
-    validator.run_all()
+    validator.run_all(jobs=args.jobs, phases=args.phases, threads=args.threads)
@@ -1,18 +1,25 @@
 """FastAPI REST endpoints"""
 
 from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
 from typing import Optional, List
-from datetime import datetime
+import json
 
-from hash_chain import Amendment, HashChain, LLMSummaryGenerator
+from hash_chain import Amendment, HashChain, LLMSummaryGenerator, now_iso
 from data_ingestion import DataIngestionPipeline
 
+try:
+    import orjson  # noqa: F401 - ORJSONResponse needs it at response time
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    DefaultResponse = JSONResponse
+
 app = FastAPI(
     title="Legal Act Change Tracker",
     description="Track legal amendments with hash chain verification",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=DefaultResponse
 )
 
 llm_generator = LLMSummaryGenerator()
@@ -24,19 +31,22 @@ class AmendmentRequest(BaseModel):
     author: str
     summary: Optional[str] = None
 
+# Static, so serialized once at import
+_ROOT_JSON = json.dumps({
+    "api": "Legal Act Change Tracker",
+    "version": "1.0.0",
+    "status": "running"
+}).encode()
+
 @app.get("/")
 def root():
     """API root"""
-    return {
-        "api": "Legal Act Change Tracker",
-        "version": "1.0.0",
-        "status": "running"
-    }
+    return Response(content=_ROOT_JSON, media_type="application/json")
 
 @app.get("/health")
 def health():
     """Health check"""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {"status": "healthy", "timestamp": now_iso()}
 
 @app.get("/amendments")
 def list_amendments(skip: int = 0, limit: int = 10):
@@ -44,8 +54,10 @@ def list_amendments(skip: int = 0, limit: int = 10):
     if not current_chain:
         return {"error": "No chain loaded"}
     
-    history = current_chain.get_history()
-    return {"amendments": history[skip:skip + limit], "total": len(history)}
+    return {
+        "amendments": current_chain.get_history_slice(skip, limit),
+        "total": len(current_chain.chain)
+    }
 
 @app.post("/amendments")
 def add_amendment(request: AmendmentRequest):
@@ -74,7 +86,7 @@ def verify():
     return {
         "valid": is_valid,
         "amendments": len(current_chain.chain),
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
 
 @app.get("/statistics")
@@ -83,12 +95,9 @@ def statistics():
     if not current_chain:
         raise HTTPException(status_code=404, detail="No chain loaded")
     
-    history = current_chain.get_history()
-    substantive = sum(1 for e in history if e['amendment']['change_type'] == 'substantive')
-    editorial = sum(1 for e in history if e['amendment']['change_type'] == 'editorial')
-    
+    stats = current_chain.get_statistics()
     return {
-        "total": len(history),
-        "substantive": substantive,
-        "editorial": editorial
+        "total": stats['total'],
+        "substantive": stats['by_type']['substantive'],
+        "editorial": stats['by_type']['editorial']
     }
@@ -1,16 +1,27 @@
 from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List
-from datetime import datetime
+from typing import Optional, List, Iterator
+import json
 
-from hash_chain import Amendment, HashChain, LLMSummaryGenerator
+from hash_chain import Amendment, HashChain, LLMSummaryGenerator, now_iso
 from data_ingestion import DataIngestionPipeline
 
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+    _dumps = orjson.dumps
+except ImportError:
+    DefaultResponse = JSONResponse
+    
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
+
 app = FastAPI(
     title="Legal Act Change Tracker API",
     description="Track legal amendments with hash chain verification",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=DefaultResponse
 )
 
 llm_generator = LLMSummaryGenerator()
@@ -61,7 +72,7 @@ def root():
 @app.get("/health")
 def health_check():
     """Health check"""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {"status": "healthy", "timestamp": now_iso()}
 
 # ============================================================================
 # AMENDMENT ENDPOINTS
@@ -71,21 +82,15 @@ def health_check():
 def list_amendments(
     author: Optional[str] = Query(None),
     change_type: Optional[str] = Query(None),
-    skip: int = Query(0),
-    limit: int = Query(10)
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=0)
 ):
     """Get all amendments with optional filtering"""
     if not current_chain:
         raise HTTPException(status_code=404, detail="No legal act loaded")
     
-    history = current_chain.get_history()
-    
-    if author:
-        history = [a for a in history if a['amendment']['author'].lower() == author.lower()]
-    if change_type:
-        history = [a for a in history if a['amendment']['change_type'] == change_type]
-    
-    history = history[skip:skip + limit]
+    history = current_chain.query(author=author or None, change_type=change_type or None,
+                                  skip=skip, limit=limit)
     
     responses = []
     for entry in history:
@@ -117,8 +122,7 @@ def create_amendment(request: AmendmentRequest):
     )
     
     current_chain.add_amendment(amendment)
-    history = current_chain.get_history()
-    last_entry = history[-1]
+    last_entry = current_chain.get_by_version(len(current_chain.chain))
     
     return AmendmentResponse(
         version=last_entry['version'],
@@ -137,21 +141,20 @@ def get_amendment(version: int):
     if not current_chain:
         raise HTTPException(status_code=404, detail="No legal act loaded")
     
-    history = current_chain.get_history()
-    for entry in history:
-        if entry['version'] == version:
-            return AmendmentResponse(
-                version=entry['version'],
-                hash=entry['hash'],
-                parent_hash=entry['parent_hash'],
-                content=entry['amendment']['content'],
-                change_type=entry['amendment']['change_type'],
-                author=entry['amendment']['author'],
-                summary=entry['amendment']['summary'],
-                timestamp=entry['amendment']['timestamp']
-            )
+    entry = current_chain.get_by_version(version)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Amendment {version} not found")
     
-    raise HTTPException(status_code=404, detail=f"Amendment {version} not found")
+    return AmendmentResponse(
+        version=entry['version'],
+        hash=entry['hash'],
+        parent_hash=entry['parent_hash'],
+        content=entry['amendment']['content'],
+        change_type=entry['amendment']['change_type'],
+        author=entry['amendment']['author'],
+        summary=entry['amendment']['summary'],
+        timestamp=entry['amendment']['timestamp']
+    )
 
 # ============================================================================
 # VERIFICATION ENDPOINTS
@@ -164,14 +167,13 @@ def verify_chain():
         raise HTTPException(status_code=404, detail="No legal act loaded")
     
     is_valid = current_chain.verify_integrity()
-    history = current_chain.get_history()
-    last_hash = history[-1]['hash'] if history else "N/A"
+    chain = current_chain.chain
     
     return VerificationReport(
         valid=is_valid,
-        total_amendments=len(history),
-        last_hash=last_hash,
-        timestamp=datetime.now().isoformat(),
+        total_amendments=len(chain),
+        last_hash=chain[-1].hash if chain else "N/A",
+        timestamp=now_iso(),
         message="✓ Chain valid" if is_valid else "✗ Chain invalid"
     )
 
@@ -189,12 +191,11 @@ def ingest_xml(filepath: str):
         if not current_chain:
             raise HTTPException(status_code=400, detail="Failed to ingest XML")
         
-        history = current_chain.get_history()
         return {
             "success": True,
             "act_id": current_chain.act_id,
             "act_title": current_chain.act_title,
-            "amendments_imported": len(history)
+            "amendments_imported": len(current_chain.chain)
         }
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Ingestion failed: {str(e)}")
@@ -205,12 +206,11 @@ def ingest_status():
     if not current_chain:
         return {"loaded": False, "message": "No act loaded"}
     
-    history = current_chain.get_history()
     return {
         "loaded": True,
         "act_id": current_chain.act_id,
         "act_title": current_chain.act_title,
-        "total_amendments": len(history)
+        "total_amendments": len(current_chain.chain)
     }
 
 # ============================================================================
@@ -223,19 +223,15 @@ def search_amendments(query: str):
     if not current_chain:
         raise HTTPException(status_code=404, detail="No legal act loaded")
     
-    history = current_chain.get_history()
-    query_lower = query.lower()
-    
-    results = []
-    for entry in history:
-        if (query_lower in entry['amendment']['content'].lower() or
-            query_lower in entry['amendment']['summary'].lower()):
-            results.append({
-                "version": entry['version'],
-                "hash": entry['hash'],
-                "author": entry['amendment']['author'],
-                "summary": entry['amendment']['summary']
-            })
+    results = [
+        {
+            "version": entry['version'],
+            "hash": entry['hash'],
+            "author": entry['amendment']['author'],
+            "summary": entry['amendment']['summary']
+        }
+        for entry in current_chain.search(query)
+    ]
     
     return {"query": query, "results_count": len(results), "results": results}
 
@@ -249,14 +245,22 @@ def export_json():
     if not current_chain:
         raise HTTPException(status_code=404, detail="No legal act loaded")
     
-    data = {
-        'act_id': current_chain.act_id,
-        'act_title': current_chain.act_title,
-        'exported_at': datetime.now().isoformat(),
-        'history': current_chain.get_history()
-    }
+    return StreamingResponse(_export_chunks(current_chain), media_type='application/json')
+
+def _export_chunks(chain: HashChain) -> Iterator[bytes]:
+    """Export document, serialized one history entry at a time"""
+    header = _dumps({
+        'act_id': chain.act_id,
+        'act_title': chain.act_title,
+        'exported_at': now_iso()
+    })
+    yield header[:-1] + b',"history":['
     
-    return JSONResponse(content=data)
+    first = True
+    for entry in chain.iter_history():
+        yield _dumps(entry) if first else b',' + _dumps(entry)
+        first = False
+    yield b']}'
 
 # ============================================================================
 # STATISTICS ENDPOINTS
@@ -268,17 +272,9 @@ def get_statistics():
     if not current_chain:
         raise HTTPException(status_code=404, detail="No legal act loaded")
     
-    history = current_chain.get_history()
-    substantive_count = sum(1 for e in history if e['amendment']['change_type'] == 'substantive')
-    editorial_count = sum(1 for e in history if e['amendment']['change_type'] == 'editorial')
-    
-    authors = {}
-    for entry in history:
-        author = entry['amendment']['author']
-        authors[author] = authors.get(author, 0) + 1
-    
+    stats = current_chain.get_statistics()
     return {
-        "total_amendments": len(history),
-        "by_type": {"substantive": substantive_count, "editorial": editorial_count},
-        "by_author": authors
+        "total_amendments": stats['total'],
+        "by_type": stats['by_type'],
+        "by_author": stats['by_author']
     }
@@ -1,7 +1,7 @@
 """Data ingestion from XML files"""
 
 import xml.etree.ElementTree as ET
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from datetime import datetime
 from hash_chain import Amendment, HashChain, LLMSummaryGenerator
 
@@ -11,27 +11,44 @@ class LegalDocumentParser:
     def parse_file(self, filepath: str) -> List[dict]:
         """Read XML file and extract amendments"""
         try:
-            tree = ET.parse(filepath)
-            root = tree.getroot()
-            amendments = []
-            
-            amendments_elem = root.find('Amendments')
-            if amendments_elem:
-                for amendment_elem in amendments_elem.findall('Amendment'):
-                    amendment_data = {
-                        'version': amendment_elem.findtext('Version', '1'),
-                        'content': amendment_elem.findtext('Content', ''),
-                        'author': amendment_elem.findtext('Author', 'Unknown'),
-                        'date': amendment_elem.findtext('Date', datetime.now().isoformat()),
-                        'change_type': amendment_elem.findtext('Type', 'substantive'),
-                        'summary': amendment_elem.findtext('Summary', None),
-                    }
-                    amendments.append(amendment_data)
-            
-            return amendments
+            return list(self.iter_file(filepath))
         except Exception as e:
             print(f"Error parsing XML: {e}")
             return []
+    
+    def iter_file(self, filepath: str) -> Iterator[dict]:
+        """Stream amendments from <root><Amendments><Amendment>...
+        
+        Uses iterparse, so only the current <Amendment> subtree is held in
+        memory; each one is dropped from the tree once extracted.
+        """
+        default_date = datetime.now().isoformat()
+        stack = []
+        container = None  # first <Amendments> directly under the root
+        
+        for event, elem in ET.iterparse(filepath, events=('start', 'end')):
+            if event == 'start':
+                if container is None and len(stack) == 1 and elem.tag == 'Amendments':
+                    container = elem
+                stack.append(elem)
+                continue
+            
+            stack.pop()
+            if elem.tag == 'Amendment' and stack and stack[-1] is container:
+                yield self._amendment_data(elem, default_date)
+                container.remove(elem)
+    
+    @staticmethod
+    def _amendment_data(amendment_elem, default_date: str) -> dict:
+        """Fields of one <Amendment> element"""
+        return {
+            'version': amendment_elem.findtext('Version', '1'),
+            'content': amendment_elem.findtext('Content', ''),
+            'author': amendment_elem.findtext('Author', 'Unknown'),
+            'date': amendment_elem.findtext('Date', default_date),
+            'change_type': amendment_elem.findtext('Type', 'substantive'),
+            'summary': amendment_elem.findtext('Summary', None),
+        }
 
 
 class DataIngestionPipeline:
@@ -51,15 +68,16 @@ class DataIngestionPipeline:
         
         chain = HashChain("ACT-UNKNOWN", "Unknown Legal Act", llm=self.llm_generator)
         
-        for amendment_data in amendments_data:
-            amendment = Amendment(
+        chain.add_amendments([
+            Amendment(
                 content=amendment_data['content'],
                 change_type=amendment_data['change_type'],
                 author=amendment_data['author'],
                 summary=amendment_data.get('summary'),
                 llm=self.llm_generator
             )
-            chain.add_amendment(amendment)
+            for amendment_data in amendments_data
+        ])
         
         chain.verify_integrity()
         return chain
@@ -1,11 +1,23 @@
 import os
+import copy
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 from hash_chain import Amendment, HashChain, LLMSummaryGenerator
 from data_ingestion import DataIngestionPipeline
 
+@lru_cache(maxsize=8)
+def _read_config_file(path: str, mtime_ns: int, size: int) -> dict:
+    """Parse a JSON config file (memoized per path and version on disk)
+    
+    The result is shared by every caller - copy it before handing it out.
+    """
+    with open(path, 'rb') as f:
+        return json.load(f)
+
+
 class Config:
     """Load application configuration"""
     
@@ -26,11 +38,17 @@ class Config:
             'DEBUG': os.getenv('DEBUG', 'False').lower() == 'true',
         }
         
-        if Path(self.config_file).exists():
+        try:
+            st = os.stat(self.config_file)
+        except OSError:
+            st = None  # No config file: environment and defaults only
+        
+        if st is not None:
             try:
-                with open(self.config_file, 'r') as f:
-                    file_config = json.load(f)
-                    config.update(file_config)
+                # Deep copy: nested values must not be shared between instances
+                config.update(copy.deepcopy(
+                    _read_config_file(self.config_file, st.st_mtime_ns, st.st_size)
+                ))
             except json.JSONDecodeError:
                 pass
         
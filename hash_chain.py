@@ -3,12 +3,33 @@ LEGAL ACT CHANGE TRACKER v1.0.0 - Core Engine
 Hash-chain based amendment tracking with LLM summarization
 """
 
+import atexit
 import hashlib
+import io
 import json
 import logging
+import logging.handlers
+import os
+import platform
+import re
+import sys
+import threading
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Iterable, Iterator
 import time
+from bisect import bisect_right
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial, wraps
+from itertools import count, islice
+
+# OpenSSL-backed SHA-256 (dispatches to SHA-NI/ARMv8 SHA instructions when
+# the CPU has them); bound once to skip the module lookup per node
+_sha256 = hashlib.sha256
+# Every node payload starts with these bytes: absorb them once, copy per node
+_NODE_PREFIX = _sha256(b'{"amendment": ')
+# Same (C-accelerated) ASCII string encoder json.dumps uses by default
+_json_quote = json.encoder.encode_basestring_ascii
 
 # ============================================================================
 # CONFIGURATION
@@ -35,59 +56,187 @@ class Config:
 # UTILITIES
 # ============================================================================
 
+# (epoch second, ISO string) - response timestamps only need 1s resolution
+_iso_cache = [0, ""]
+
+def now_iso() -> str:
+    """Current time as ISO string, formatted at most once per second"""
+    now = int(time.time())
+    if now != _iso_cache[0]:
+        _iso_cache[:] = [now, datetime.fromtimestamp(now).isoformat()]
+    return _iso_cache[1]
+
+
 class RateLimiter:
     """Simple rate limiting to prevent DoS"""
     
+    # Every this many checks, forget clients with no requests in the window
+    PURGE_EVERY = 1000
+    
     def __init__(self, max_requests: int = 100, window_sec: int = 60):
         self.max_requests = max_requests
         self.window_sec = window_sec
-        self.requests: Dict[str, list] = {}
+        self.requests: Dict[str, deque] = {}
+        self._checks = 0
+    
+    def _window(self, client_id: str, now: float) -> deque:
+        """Get client's request timestamps with expired ones evicted"""
+        timestamps = self.requests.setdefault(client_id, deque())
+        
+        # Timestamps are appended in order, so expired ones are at the left
+        cutoff = now - self.window_sec
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
+        
+        return timestamps
+    
+    def _purge(self, now: float):
+        """Drop clients whose newest request has left the window"""
+        cutoff = now - self.window_sec
+        for client_id in [c for c, t in self.requests.items() if not t or t[-1] <= cutoff]:
+            del self.requests[client_id]
     
     def is_allowed(self, client_id: str) -> bool:
         """Check if client can make request"""
-        now = time.time()
+        # Monotonic clock: wall-clock jumps must not reopen or stall a window
+        now = time.monotonic()
         
-        if client_id not in self.requests:
-            self.requests[client_id] = []
+        self._checks += 1
+        if self._checks % self.PURGE_EVERY == 0:
+            self._purge(now)
         
-        # Clean old requests
-        self.requests[client_id] = [
-            t for t in self.requests[client_id]
-            if now - t < self.window_sec
-        ]
+        timestamps = self._window(client_id, now)
         
         # Check limit
-        if len(self.requests[client_id]) >= self.max_requests:
+        if len(timestamps) >= self.max_requests:
             return False
         
-        self.requests[client_id].append(now)
+        timestamps.append(now)
         return True
+    
+    def get_remaining(self, client_id: str) -> int:
+        """Requests left for client in the current window"""
+        if client_id not in self.requests:
+            return self.max_requests
+        return max(0, self.max_requests - len(self._window(client_id, time.monotonic())))
 
 
 class AuditLog:
-    """Centralized audit logging"""
+    """Centralized audit logging
+    
+    Records are buffered and written to the file in batches; warnings
+    (e.g. tampering) flush the buffer immediately, and a background thread
+    writes out whatever is buffered every FLUSH_INTERVAL seconds, so a
+    quiet process never holds records for long. All AuditLog instances
+    for the same file share one handler.
+    """
+    
+    BUFFER_SIZE = 512
+    FLUSH_INTERVAL = 1.0
+    
+    # Absolute log path -> buffering handler attached to the "audit" logger
+    _handlers: Dict[str, logging.handlers.MemoryHandler] = {}
+    # Chains are created from API/worker threads: one handler per file
+    _handlers_lock = threading.Lock()
+    _flusher: Optional[threading.Thread] = None
     
     def __init__(self, filename: str = "audit.log"):
         self.logger = logging.getLogger("audit")
-        handler = logging.FileHandler(filename)
-        handler.setFormatter(logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s'
-        ))
-        self.logger.addHandler(handler)
+        self.path = path = os.path.abspath(filename)
+        with self._handlers_lock:
+            handler = self._handlers.get(path)
+            if handler is None:
+                target = logging.FileHandler(path)
+                target.setFormatter(logging.Formatter(
+                    '%(asctime)s - %(levelname)s - %(message)s'
+                ))
+                handler = logging.handlers.MemoryHandler(
+                    self.BUFFER_SIZE, flushLevel=logging.WARNING, target=target
+                )
+                self._handlers[path] = handler
+                self.logger.addHandler(handler)
+            self._start_flusher()
+        self.handler = handler
         self.logger.setLevel(logging.INFO)
     
-    def log(self, event: str, details: Dict = None):
+    def __reduce__(self):
+        # Handlers hold locks: a copy just reattaches to the file's shared one
+        return type(self), (self.path,)
+    
+    def log(self, event: str, details: Dict = None, level: int = logging.INFO):
         """Log event with optional details"""
         msg = event
         if details:
             msg += " | " + " | ".join(f"{k}={v}" for k, v in details.items())
-        self.logger.info(msg)
+        self.logger.log(level, msg)
+    
+    def flush(self):
+        """Write buffered records to the file now"""
+        self.handler.flush()
+    
+    @classmethod
+    def flush_all(cls):
+        """Write every file's buffered records now (e.g. before a worker exits)"""
+        for handler in list(cls._handlers.values()):
+            handler.flush()
+    
+    @classmethod
+    def _start_flusher(cls):
+        """Start the timed-flush thread once per process"""
+        if cls._flusher is None:
+            cls._flusher = threading.Thread(
+                target=cls._flush_periodically, name="audit-flush", daemon=True
+            )
+            cls._flusher.start()
+    
+    @classmethod
+    def _flush_periodically(cls):
+        while True:
+            time.sleep(cls.FLUSH_INTERVAL)
+            cls.flush_all()
+    
+    @classmethod
+    def _after_fork(cls):
+        """Reset a forked child: fork() copies the buffers but not the flusher
+        
+        Buffered records are the parent's to write, so the child drops them.
+        """
+        for handler in cls._handlers.values():
+            handler.buffer.clear()
+        cls._flusher = None
+        if cls._handlers:
+            cls._start_flusher()
+
+
+atexit.register(AuditLog.flush_all)
+os.register_at_fork(after_in_child=AuditLog._after_fork)
 
 
 # ============================================================================
 # CORE CLASSES
 # ============================================================================
 
+def _compile_replacements(replacements: Dict[str, str]) -> Callable[[str], str]:
+    """Build a one-pass substitution over every phrase variant
+    
+    Returns pattern.sub pre-bound to a dict lookup callback, so callers
+    don't allocate a closure per call.
+    """
+    lookup = {}
+    for legal, plain in replacements.items():
+        lookup.setdefault(legal, plain)
+        # Handle capitalized versions
+        if legal[0].islower():
+            lookup.setdefault(legal[0].upper() + legal[1:], plain.capitalize())
+    
+    # Longest first, so 'przepisy' wins over its prefix 'przepis'.
+    # Case is handled by the variants above rather than re.IGNORECASE,
+    # which is markedly slower on large alternations.
+    phrases = sorted(lookup, key=len, reverse=True)
+    pattern = re.compile("|".join(map(re.escape, phrases)))
+    return partial(pattern.sub, lambda m: lookup[m.group()])
+
+
 class LLMSummaryGenerator:
     """Convert legal text to plain language"""
     
@@ -117,6 +266,20 @@ class LLMSummaryGenerator:
         'shall': 'musi', 'wherein': 'gdzie', 'thereof': 'tego',
     }
     
+    # Formatting fixes (matched case-sensitively, so no variants are added)
+    NORMALIZE = {'ARTYKUŁ': 'Artykuł', 'USTAWA': 'Ustawa'}
+    
+    # Compiled once per class: a single scan replaces per-phrase passes
+    _substitute = staticmethod(_compile_replacements({**REPLACEMENTS, **NORMALIZE}))
+    
+    MAX_LENGTH = 200
+    
+    # Input prefix that fully determines the first MAX_LENGTH + 1 output
+    # chars, even if every phrase in it shrinks as much as the dictionary
+    # allows (plus room for a phrase cut at the boundary)
+    _SCAN_LIMIT = (int((MAX_LENGTH + 1) / min(len(p) / len(l) for l, p in REPLACEMENTS.items())) + 1
+                   + 2 * max(map(len, REPLACEMENTS)))
+    
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key
         self.use_real_llm = api_key is not None
@@ -134,22 +297,18 @@ class LLMSummaryGenerator:
     
     def _fallback_simplify(self, text: str) -> str:
         """Simple rule-based simplification"""
-        simple = text
-        
-        for legal, plain in self.REPLACEMENTS.items():
-            simple = simple.replace(legal, plain)
-            # Handle capitalized versions
-            if legal[0].islower():
-                capitalized = legal[0].upper() + legal[1:]
-                simple = simple.replace(capitalized, plain.capitalize())
-        
-        # Normalize formatting
-        simple = simple.replace('ARTYKUŁ', 'Artykuł')
-        simple = simple.replace('USTAWA', 'Ustawa')
+        # Output is capped anyway, so never rewrite more than can show up
+        return self._rewrite(text[:self._SCAN_LIMIT])
+    
+    @classmethod
+    @lru_cache(maxsize=8192)
+    def _rewrite(cls, text: str) -> str:
+        """Replace phrases and truncate (memoized: legal boilerplate repeats)"""
+        simple = cls._substitute(text)
         
         # Truncate if too long
-        if len(simple) > 200:
-            simple = simple[:200].rsplit(' ', 1)[0] + '...'
+        if len(simple) > cls.MAX_LENGTH:
+            simple = simple[:cls.MAX_LENGTH].rsplit(' ', 1)[0] + '...'
         
         return simple
 
@@ -159,6 +318,10 @@ class Amendment:
     
     VALID_TYPES = {'substantive', 'editorial'}
     
+    # No per-instance __dict__: large chains hold one Amendment per node
+    __slots__ = ('content', 'change_type', 'author', 'summary', 'timestamp',
+                 '_canonical', '_dict', '_chains')
+    
     def __init__(self, content: str, change_type: str, author: str,
                  summary: Optional[str] = None, llm: Optional[LLMSummaryGenerator] = None):
         """
@@ -178,52 +341,225 @@ class Amendment:
         if not isinstance(author, str) or not author.strip():
             raise ValueError("Author required")
         
-        self.content = content
-        self.change_type = change_type
-        self.author = author
-        self.timestamp = datetime.now().isoformat()
-        self.summary = summary or (llm.simplify(content) if llm else "No summary")
+        # Initial values, not edits: skip __setattr__'s cache invalidation
+        init = object.__setattr__
+        init(self, 'content', content)
+        init(self, 'change_type', change_type)
+        init(self, 'author', author)
+        init(self, 'timestamp', datetime.now().isoformat())
+        init(self, 'summary', summary or (llm.simplify(content) if llm else "No summary"))
+        init(self, '_canonical', None)
+        init(self, '_dict', None)
+        # Chains whose indexes cover this amendment (see HashChain._index_nodes)
+        init(self, '_chains', ())
+    
+    # Fields covered by to_dict() and the canonical JSON (and so by the node hash)
+    _HASHED_FIELDS = frozenset(('content', 'change_type', 'author', 'summary', 'timestamp'))
+    
+    def __setattr__(self, name: str, value: Any):
+        """Assign a field, dropping the cached dict and canonical JSON
+        
+        Plain attribute assignment is the only supported way to change an
+        amendment: it is what lets verification see in-place edits and
+        the indexes of the chains holding it notice them.
+        object.__setattr__ bypasses both.
+        """
+        object.__setattr__(self, name, value)
+        if name in self._HASHED_FIELDS:
+            object.__setattr__(self, '_canonical', None)
+            object.__setattr__(self, '_dict', None)
+            for chain in self._chains:
+                chain._version += 1
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Fields only (pickle/copy): caches and chain links are not copied"""
+        return {name: getattr(self, name) for name in self._HASHED_FIELDS}
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, '_canonical', None)
+        object.__setattr__(self, '_dict', None)
+        object.__setattr__(self, '_chains', ())
+    
+    def _canonical_json(self, fresh: bool = False) -> bytes:
+        """json.dumps(to_dict(), sort_keys=True) as bytes, cached for string fields
+        
+        The usual all-string amendment is assembled directly in sorted key
+        order with json's own C string encoder; anything else goes through
+        json.dumps and is not cached, since it may be mutable. fresh=True
+        rebuilds it from the fields even if cached.
+        """
+        if self._canonical is not None and not fresh:
+            return self._canonical
+        
+        fields = (self.author, self.change_type, self.content, self.summary, self.timestamp)
+        if not all(type(f) is str for f in fields):
+            return json.dumps(self.to_dict(), sort_keys=True).encode()
+        
+        author, change_type, content, summary, timestamp = map(_json_quote, fields)
+        canonical = (f'{{"author": {author}, "change_type": {change_type}, '
+                     f'"content": {content}, "summary": {summary}, '
+                     f'"timestamp": {timestamp}}}').encode()
+        object.__setattr__(self, '_canonical', canonical)
+        return canonical
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return {
-            'content': self.content,
-            'change_type': self.change_type,
-            'author': self.author,
-            'summary': self.summary,
-            'timestamp': self.timestamp
-        }
+        """Convert to dictionary (cached and shared - do not mutate)"""
+        if self._dict is None:
+            object.__setattr__(self, '_dict', {
+                'content': self.content,
+                'change_type': self.change_type,
+                'author': self.author,
+                'summary': self.summary,
+                'timestamp': self.timestamp
+            })
+        return self._dict
 
 
 class ChainNode:
-    """Single node in amendment chain"""
+    """Single node in amendment chain
+    
+    Hashes are stored as raw 32-byte SHA-256 digests (`digest`,
+    `parent_digest`); `hash`/`parent_hash` are their hex form for the
+    API/JSON boundary.
+    """
+    
+    __slots__ = ('amendment', 'digest', 'parent_digest', '_verified', '_entry')
     
-    def __init__(self, amendment: Amendment, parent_hash: Optional[str] = None):
+    def __init__(self, amendment: Amendment, parent_hash: Optional[str] = None,
+                 *, parent_digest: Optional[bytes] = None):
         if not isinstance(amendment, Amendment):
             raise TypeError("Amendment required")
         
         self.amendment = amendment
-        self.parent_hash = parent_hash
-        self.hash = self._calculate_hash()
+        if parent_digest is not None:
+            self.parent_digest = parent_digest
+        else:
+            self.parent_hash = parent_hash
+        self.digest = self._calculate_digest()
+        self._verified = self._entry = None
+        self._seal()
+    
+    @classmethod
+    def _trusted(cls, amendment: Amendment, parent_digest: Optional[bytes]) -> 'ChainNode':
+        """Create node without argument checks (callers have validated the amendment)"""
+        node = cls.__new__(cls)
+        node.amendment = amendment
+        node.parent_digest = parent_digest
+        node.digest = node._calculate_digest()
+        node._verified = node._entry = None
+        node._seal()
+        return node
+    
+    @property
+    def hash(self) -> str:
+        """Hex SHA-256 of this node"""
+        return self.digest.hex()
+    
+    @hash.setter
+    def hash(self, value: str):
+        self.digest = bytes.fromhex(value)
+    
+    @property
+    def parent_hash(self) -> Optional[str]:
+        """Hex SHA-256 of the previous node (None for the first node)"""
+        return None if self.parent_digest is None else self.parent_digest.hex()
+    
+    @parent_hash.setter
+    def parent_hash(self, value: Optional[str]):
+        self.parent_digest = None if value is None else bytes.fromhex(value)
     
-    def _calculate_hash(self) -> str:
-        """Calculate SHA-256 hash of this node"""
+    def _calculate_digest(self, fresh: bool = False) -> bytes:
+        """Calculate SHA-256 digest of this node
+        
+        The hashed bytes are json.dumps({'amendment': to_dict(),
+        'parent_hash': hex}, sort_keys=True), fed to SHA-256 in pieces
+        around the amendment's canonical JSON (cached unless fresh).
+        """
         try:
-            data = json.dumps({
-                'amendment': self.amendment.to_dict(),
-                'parent_hash': self.parent_hash
-            }, sort_keys=True)
-            return hashlib.sha256(data.encode()).hexdigest()
+            h = _NODE_PREFIX.copy()
+            h.update(self.amendment._canonical_json(fresh))
+            if self.parent_digest is None:
+                h.update(b', "parent_hash": null}')
+            else:
+                h.update(b', "parent_hash": "%s"}' % self.parent_digest.hex().encode())
+            return h.digest()
         except Exception as e:
             raise RuntimeError(f"Hash calculation failed: {e}")
     
-    def verify(self) -> bool:
-        """Verify hash integrity"""
-        return self.hash == self._calculate_hash()
+    def _seal(self):
+        """Remember the exact objects a successful check was made on (see verify)"""
+        digest, parent = self.digest, self.parent_digest
+        # Only immutable values: a bytearray could change under the same identity
+        if type(digest) is bytes and (parent is None or type(parent) is bytes):
+            self._verified = (self.amendment._canonical_json(), parent, digest)
+    
+    def verify(self, deep: bool = False) -> bool:
+        """Verify hash integrity
+        
+        The re-hash is skipped when the amendment's canonical JSON, parent
+        and digest are the very objects last verified. Assigning any of
+        them (or any amendment field) replaces the object, so in-place
+        tampering always forces a recompute. deep=True always re-hashes,
+        from the amendment fields themselves.
+        """
+        seen = self._verified
+        if (not deep and seen is not None and seen[0] is self.amendment._canonical_json()
+                and seen[1] is self.parent_digest and seen[2] is self.digest):
+            return True
+        if self.digest != self._calculate_digest(deep):
+            return False
+        self._seal()
+        return True
+    
+    def history_entry(self, version: int) -> Dict[str, Any]:
+        """History entry for this node as amendment `version` (cached - do not mutate)
+        
+        Built once, hex strings included, and reused while the digest,
+        parent and amendment dict are the very objects it was built from -
+        the same identity test verify() trusts its memo on.
+        """
+        digest, parent = self.digest, self.parent_digest
+        amendment = self.amendment.to_dict()
+        cached = self._entry
+        if (cached is not None and cached[0] is digest and cached[1] is parent
+                and cached[2] is amendment and cached[3]['version'] == version):
+            return cached[3]
+        
+        entry = {
+            'version': version,
+            'hash': digest.hex(),
+            'parent_hash': None if parent is None else parent.hex(),
+            'amendment': amendment
+        }
+        # Only immutable values: a bytearray could change under the same identity
+        if type(digest) is bytes and (parent is None or type(parent) is bytes):
+            self._entry = (digest, parent, amendment, entry)
+        return entry
+
+
+def _locked(method):
+    """Run a HashChain method under the chain's lock"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class HashChain:
-    """Immutable amendment chain"""
+    """Immutable amendment chain
+    
+    Appends, verification and the lazily synced caches run under a
+    per-chain lock, so API worker threads can share one chain.
+    """
+    
+    __slots__ = ('act_id', 'act_title', 'chain', 'llm', 'audit',
+                 '_merkle_digests', '_merkle_levels',
+                 '_by_author', '_by_type', '_author_counts',
+                 '_search_segments', '_search_starts', '_search_corpus',
+                 '_indexed_count', '_indexed_version', '_version', '_lock')
     
     def __init__(self, act_id: str, act_title: str, llm: Optional[LLMSummaryGenerator] = None):
         if not (isinstance(act_id, str) and act_id.strip()):
@@ -236,15 +572,54 @@ class HashChain:
         self.chain: List[ChainNode] = []
         self.llm = llm
         self.audit = AuditLog()
+        # Reentrant: locked methods call each other (e.g. search -> _sync_indexes)
+        self._lock = threading.RLock()
+        
+        # Merkle tree over node digests (RFC 6962 shape): _merkle_digests are
+        # the digests as appended, level 0 their leaf hashes, last level = root.
+        # Appends only record the digest; levels catch up in _merkle_sync
+        self._merkle_digests: List[bytes] = []
+        self._merkle_levels: List[List[bytes]] = [[]]
+        
+        # query()/get_statistics() indexes: lowercased author / change_type
+        # -> chain indices, plus per-author counts
+        self._by_author: Dict[str, List[int]] = {}
+        self._by_type: Dict[str, List[int]] = {}
+        self._author_counts: Counter = Counter()
+        # search() corpus: lowercased content and summary of every node, as
+        # NUL-separated segments of one string; segment k belongs to node k // 2
+        self._search_segments: List[str] = []
+        self._search_starts: List[int] = []
+        self._search_corpus: Optional[str] = None
+        # Leading nodes the indexes cover, and the _version they were built
+        # at; _version moves on amendment edits and invalidate_indexes()
+        self._indexed_count = 0
+        self._indexed_version = 0
+        self._version = 0
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle/copy every slot except the lock"""
+        return {name: getattr(self, name) for name in self.__slots__ if name != '_lock'}
     
+    def __setstate__(self, state: Dict[str, Any]):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._lock = threading.RLock()
+        # Restored amendments carry no chain links (see Amendment.__getstate__):
+        # rebuild the indexes on first use so edits to them are tracked again
+        self._version += 1
+    
+    @_locked
     def add_amendment(self, amendment: Amendment) -> str:
         """Add amendment to chain"""
         if not isinstance(amendment, Amendment):
             raise TypeError("Amendment required")
         
-        parent_hash = self.chain[-1].hash if self.chain else None
-        node = ChainNode(amendment, parent_hash)
+        parent_digest = self.chain[-1].digest if self.chain else None
+        node = ChainNode._trusted(amendment, parent_digest)
         self.chain.append(node)
+        self._merkle_digests.append(node.digest)
+        self._sync_indexes()
         
         self.audit.log("amendment_added", {
             'act': self.act_id,
@@ -254,41 +629,375 @@ class HashChain:
         
         return node.hash
     
+    @_locked
+    def add_amendments(self, amendments: Iterable[Amendment]) -> List[str]:
+        """Add many amendments in order, with one audit entry for the batch"""
+        amendments = list(amendments)
+        if not all(isinstance(a, Amendment) for a in amendments):
+            raise TypeError("Amendment required")
+        
+        # Each digest covers its parent's, so hashing stays sequential;
+        # the batch only saves per-call overhead, list growth and audit writes
+        nodes = []
+        append, make_node = nodes.append, ChainNode._trusted
+        parent_digest = self.chain[-1].digest if self.chain else None
+        for amendment in amendments:
+            node = make_node(amendment, parent_digest)
+            append(node)
+            parent_digest = node.digest
+        self.chain.extend(nodes)
+        self._merkle_digests.extend(node.digest for node in nodes)
+        self._sync_indexes()
+        
+        if nodes:
+            self.audit.log("amendments_added", {
+                'act': self.act_id,
+                'count': len(nodes),
+                'first_hash': nodes[0].hash[:16],
+                'last_hash': nodes[-1].hash[:16]
+            })
+            self.audit.flush()
+        
+        return [node.hash for node in nodes]
+    
+    # ------------------------------------------------------------------
+    # Merkle tree
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _merkle_leaf(digest: bytes) -> bytes:
+        """Leaf hash (0x00 prefix: can never equal an interior node's input)"""
+        return _sha256(b'\x00' + digest).digest()
+    
+    @staticmethod
+    def _merkle_parent(left: bytes, right: bytes) -> bytes:
+        """Interior node hash (0x01 prefix keeps it distinct from leaves)"""
+        return _sha256(b'\x01' + left + right).digest()
+    
+    def _merkle_sync(self):
+        """Hash the leaves appended since the last call and their paths to the root
+        
+        Only nodes right of the previously hashed edge are (re)computed, so
+        keeping the tree current costs O(new leaves + log n) per call.
+        """
+        digests, levels = self._merkle_digests, self._merkle_levels
+        start = len(levels[0])
+        if start == len(digests):
+            return
+        levels[0].extend(map(self._merkle_leaf, digests[start:]))
+        
+        level = 0
+        while len(levels[level]) > 1:
+            if level + 1 == len(levels):
+                levels.append([])
+            nodes, upper = levels[level], levels[level + 1]
+            # First parent that changed; an odd last node is promoted unchanged
+            start //= 2
+            del upper[start:]
+            for k in range(2 * start, len(nodes), 2):
+                if k + 1 < len(nodes):
+                    upper.append(self._merkle_parent(nodes[k], nodes[k + 1]))
+                else:
+                    upper.append(nodes[k])
+            level += 1
+    
+    @staticmethod
+    def _merkle_commit(top: bytes, size: int) -> bytes:
+        """Published root: the tree head bound to the leaf count (0x02 prefix)
+        
+        The leaf count fixes which levels promote a node, so without it one
+        proof could be replayed under a different size (and version).
+        """
+        return _sha256(b'\x02' + size.to_bytes(8, 'big') + top).digest()
+    
+    @_locked
+    def get_merkle_root(self) -> Optional[str]:
+        """Hex Merkle root over all amendments (None for an empty chain)"""
+        self._merkle_sync()
+        top = self._merkle_levels[-1]
+        if not top:
+            return None
+        return self._merkle_commit(top[0], len(self._merkle_digests)).hex()
+    
+    @_locked
+    def get_merkle_size(self) -> int:
+        """Number of amendments the Merkle root covers"""
+        return len(self._merkle_digests)
+    
+    @_locked
+    def get_inclusion_proof(self, version: int) -> List[bytes]:
+        """Sibling hashes from amendment `version` (1-based) up to the root
+        
+        Levels where the node is promoted (no sibling) contribute nothing,
+        so the proof is only valid together with the tree size.
+        """
+        if not 1 <= version <= len(self._merkle_digests):
+            raise ValueError(f"Amendment {version} not found")
+        
+        self._merkle_sync()
+        proof = []
+        index = version - 1
+        for nodes in self._merkle_levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(nodes):
+                proof.append(nodes[sibling])
+            index //= 2
+        return proof
+    
+    @classmethod
+    def verify_inclusion(cls, digest: bytes, version: int, proof: List[bytes],
+                         root: str, size: int) -> bool:
+        """Check that node `digest` is amendment `version` under hex `root`
+        
+        `size` is the leaf count the root was published with (see
+        get_merkle_size); the root commits to it, and it fixes the path
+        shape, so the proof has to match it exactly in length.
+        """
+        if not 1 <= version <= size:
+            return False
+        
+        node = cls._merkle_leaf(digest)
+        index, width = version - 1, size
+        used = 0
+        while width > 1:
+            if index % 2 or index + 1 < width:
+                if used == len(proof):
+                    return False
+                sibling = proof[used]
+                used += 1
+                if index % 2:
+                    node = cls._merkle_parent(sibling, node)
+                else:
+                    node = cls._merkle_parent(node, sibling)
+            index //= 2
+            width = (width + 1) // 2
+        return used == len(proof) and cls._merkle_commit(node, size).hex() == root
+    
+    @_locked
+    def verify_amendment(self, version: int) -> bool:
+        """Verify a single amendment in O(log n) via its Merkle path
+        
+        Raises ValueError if there is no amendment `version`.
+        """
+        if not 1 <= version <= len(self.chain):
+            raise ValueError(f"Amendment {version} not found")
+        
+        node = self.chain[version - 1]
+        size = len(self._merkle_digests)
+        if version > size or not node.verify():
+            return False
+        return self.verify_inclusion(
+            node.digest, version, self.get_inclusion_proof(version), self.get_merkle_root(), size
+        )
+    
+    # ------------------------------------------------------------------
+    # Filtered queries
+    # ------------------------------------------------------------------
+    
+    @_locked
+    def invalidate_indexes(self):
+        """Rebuild the query/statistics/search indexes on next use
+        
+        Appends and amendment field edits are tracked automatically; call
+        this after replacing or reordering nodes in `chain` directly.
+        """
+        self._version += 1
+    
+    def _sync_indexes(self):
+        """Index nodes appended since the last sync; rebuild after any other change
+        
+        Runs on every append, so reads only check two counters. A chain
+        that got shorter can only mean direct mutation, so it rebuilds too.
+        """
+        if self._indexed_version != self._version or self._indexed_count > len(self.chain):
+            self._by_author.clear()
+            self._by_type.clear()
+            self._author_counts.clear()
+            self._search_segments.clear()
+            self._search_starts.clear()
+            self._search_corpus = None
+            self._indexed_count = 0
+            self._indexed_version = self._version
+        if self._indexed_count < len(self.chain):
+            self._index_nodes(self._indexed_count)
+    
+    def _index_nodes(self, start: int):
+        """Add chain[start:] to the indexes"""
+        # Locals for the per-node loop
+        by_author, by_type = self._by_author, self._by_type
+        author_counts = self._author_counts
+        segments, starts = self._search_segments, self._search_starts
+        offset = starts[-1] + len(segments[-1]) + 1 if segments else 0
+        
+        for i in range(start, len(self.chain)):
+            amendment = self.chain[i].amendment
+            if self not in amendment._chains:
+                # So that editing the amendment bumps this chain's _version
+                object.__setattr__(amendment, '_chains', amendment._chains + (self,))
+            author = amendment.author
+            by_author.setdefault(author.lower(), []).append(i)
+            by_type.setdefault(amendment.change_type, []).append(i)
+            author_counts[author] += 1
+            for text in (amendment.content, amendment.summary):
+                text = text.lower()
+                starts.append(offset)
+                segments.append(text)
+                offset += len(text) + 1
+        self._search_corpus = None
+        self._indexed_count = len(self.chain)
+    
+    @_locked
+    def query(self, author: Optional[str] = None, change_type: Optional[str] = None,
+              skip: int = 0, limit: int = 10) -> List[Dict[str, Any]]:
+        """Page of history filtered by author (case-insensitive) and change type
+        
+        Only entries from the smaller matching index are examined, and dicts
+        are built for the requested page alone.
+        """
+        if author is None and change_type is None:
+            return self.get_history_slice(skip, limit)
+        
+        self._sync_indexes()
+        by_author = self._by_author.get(author.lower(), []) if author is not None else None
+        by_type = self._by_type.get(change_type, []) if change_type is not None else None
+        
+        if by_author is None:
+            candidates = by_type
+        elif by_type is None:
+            candidates = by_author
+        elif len(by_author) <= len(by_type):
+            candidates = (i for i in by_author
+                          if self.chain[i].amendment.change_type == change_type)
+        else:
+            candidates = (i for i in by_type
+                          if self.chain[i].amendment.author.lower() == author.lower())
+        
+        skip, limit = max(skip, 0), max(limit, 0)
+        return [self._node_to_dict(self.chain[i], i + 1)
+                for i in islice(candidates, skip, skip + limit)]
+    
+    @_locked
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """History entries whose content or summary contains `query` (case-insensitive)
+        
+        Scans one pre-lowered corpus with str.find, so the substring search
+        runs in C rather than as a Python loop over entries.
+        """
+        self._sync_indexes()
+        if not self.chain:
+            return []
+        if self._search_corpus is None:
+            self._search_corpus = '\0'.join(self._search_segments)
+        corpus, starts, segments = self._search_corpus, self._search_starts, self._search_segments
+        needle = query.lower()
+        
+        results = []
+        pos = corpus.find(needle)
+        while pos != -1:
+            k = bisect_right(starts, pos) - 1
+            if pos + len(needle) <= starts[k] + len(segments[k]):
+                node = k // 2
+                results.append(self._node_to_dict(self.chain[node], node + 1))
+                # Skip to the next node's first segment
+                if 2 * node + 2 >= len(starts):
+                    break
+                pos = corpus.find(needle, starts[2 * node + 2])
+            else:
+                # Match runs across a segment boundary
+                pos = corpus.find(needle, pos + 1)
+        return results
+    
+    @_locked
+    def get_statistics(self) -> Dict[str, Any]:
+        """Amendment counts in total, per change type and per author"""
+        self._sync_indexes()
+        by_type = {t: len(self._by_type.get(t, ())) for t in sorted(Amendment.VALID_TYPES)}
+        return {
+            'total': len(self.chain),
+            'by_type': by_type,
+            'by_author': dict(self._author_counts)
+        }
+    
+    # History entry for a single node (node, version) -> dict
+    _node_to_dict = staticmethod(ChainNode.history_entry)
+    
+    @_locked
     def get_history(self) -> List[Dict[str, Any]]:
-        """Get complete amendment history"""
-        return [{
-            'version': i + 1,
-            'hash': node.hash,
-            'parent_hash': node.parent_hash,
-            'amendment': node.amendment.to_dict()
-        } for i, node in enumerate(self.chain)]
-    
-    def verify_integrity(self) -> bool:
-        """Verify chain hasn't been tampered with"""
+        """Get complete amendment history
+        
+        Built from the live chain on every call; each entry is the node's
+        cached history_entry(), rebuilt only for nodes that changed.
+        """
+        return list(map(self._node_to_dict, self.chain, count(1)))
+    
+    @_locked
+    def get_by_version(self, version: int) -> Optional[Dict[str, Any]]:
+        """History entry for amendment `version` (1-based), or None"""
+        if not 1 <= version <= len(self.chain):
+            return None
+        return self._node_to_dict(self.chain[version - 1], version)
+    
+    @_locked
+    def get_history_slice(self, skip: int, limit: int) -> List[Dict[str, Any]]:
+        """Get one page of history, building entries only for that page
+        
+        Same entries as get_history()[skip:skip + limit], negative bounds included.
+        """
+        start, stop, _ = slice(skip, skip + limit).indices(len(self.chain))
+        return [
+            self._node_to_dict(node, i + 1)
+            for i, node in enumerate(self.chain[start:stop], start=start)
+        ]
+    
+    @_locked
+    def iter_history(self) -> Iterator[Dict[str, Any]]:
+        """Yield history entries one at a time, without building the full list
+        
+        Iterates a snapshot of the chain taken at call time.
+        """
+        return map(self._node_to_dict, self.chain[:], count(1))
+    
+    @_locked
+    def verify_integrity(self, deep: bool = False) -> bool:
+        """Verify chain hasn't been tampered with
+        
+        Nodes unchanged since their last successful check skip the re-hash
+        (see ChainNode.verify); deep=True re-hashes every node.
+        """
         if len(self.chain) > Config.MAX_CHAIN_SIZE:
             self.audit.log("chain_too_large", {
                 'act': self.act_id,
                 'size': len(self.chain)
-            })
+            }, level=logging.WARNING)
             return False
         
-        for i, node in enumerate(self.chain):
-            # Check node hash
-            if not node.verify():
-                self.audit.log("tampering_detected", {
-                    'act': self.act_id,
-                    'node': i,
-                    'reason': 'hash_mismatch'
-                })
-                return False
-            
-            # Check parent link
-            if i > 0 and node.parent_hash != self.chain[i-1].hash:
+        # Check every node in one pass (unless deep, unchanged nodes skip the re-hash),
+        # compare parent links as whole columns at C speed, and only walk
+        # node by node to locate the first failure
+        chain = self.chain
+        intact = [node.verify(deep) for node in chain]
+        stored = [node.digest for node in chain]
+        parents = [node.parent_digest for node in chain]
+        
+        # The Merkle tree recorded every digest at append time, so it also catches
+        # a forgery that rewrote nodes and re-hashed/re-linked consistently
+        leaves = self._merkle_digests
+        
+        if not all(intact) or parents[1:] != stored[:-1] or stored != leaves:
+            for i in range(max(len(stored), len(leaves))):
+                if i < len(stored) and not intact[i]:
+                    reason = 'hash_mismatch'
+                elif 0 < i < len(stored) and parents[i] != stored[i-1]:
+                    reason = 'parent_link_broken'
+                elif i >= len(stored) or i >= len(leaves) or stored[i] != leaves[i]:
+                    reason = 'merkle_mismatch'
+                else:
+                    continue
                 self.audit.log("tampering_detected", {
                     'act': self.act_id,
                     'node': i,
-                    'reason': 'parent_link_broken'
-                })
+                    'reason': reason
+                }, level=logging.WARNING)
                 return False
         
         self.audit.log("chain_verified", {
@@ -296,6 +1005,7 @@ class HashChain:
             'status': 'valid',
             'amendments': len(self.chain)
         })
+        self.audit.flush()
         return True
 
 
@@ -366,6 +1076,9 @@ NEXT STEPS:
 class ReleaseValidator:
     """Final validation before release"""
     
+    # Sources (and whole source trees) that already passed, keyed by content hash
+    SYNTAX_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "release_validator")
+    
     def __init__(self):
         self.checks = {
             'syntax': False,
@@ -375,76 +1088,153 @@ class ReleaseValidator:
             'integration': False,
             'code_review': False
         }
+        self._buf = io.StringIO()
+        # One generator shared by every stage
+        self._llm = LLMSummaryGenerator()
     
-    def validate_all(self) -> bool:
-        """Run all validation checks"""
-        print("\n" + "="*70)
-        print("FINAL RELEASE VALIDATION")
-        print("="*70 + "\n")
+    # (check, banner, success message, failure prefix, method name)
+    STAGES = (
+        ('syntax', "🔍 Syntax Validation...", "Syntax valid", "Syntax error", '_syntax_check'),
+        ('unit_tests', "🧪 Running Unit Tests...", "All unit tests passed", "Unit test failed", '_run_unit_tests'),
+        ('security', "🔒 Security Validation...", "Security checks passed", "Security check failed", '_run_security_tests'),
+        ('performance', "⚡ Performance Testing...", "Performance acceptable", "Performance test failed", '_run_performance_tests'),
+        ('integration', "🔗 Integration Testing...", "Integration tests passed", "Integration test failed", '_run_integration_tests'),
+    )
+    
+    # Stages that run even when the tree already passed: timing depends on
+    # the machine and its load, not only on the sources
+    ALWAYS_RUN = frozenset({'performance'})
+    
+    # Dependency pins that are part of the cache key, next to the sources
+    ENV_FILES = ('constraints.txt', 'requirements.txt')
+    
+    def _write(self, line: str = ""):
+        """Buffer one line of report output"""
+        self._buf.write(line + "\n")
+    
+    def _flush(self):
+        """Write buffered output to stdout in a single call"""
+        sys.stdout.write(self._buf.getvalue())
+        sys.stdout.flush()
+        self._buf = io.StringIO()
+    
+    def validate_all(self, jobs: Optional[int] = None, use_cache: bool = True) -> bool:
+        """Run all validation checks
         
-        all_passed = True
+        Stages build their own fixtures, so they run concurrently on up to
+        `jobs` threads (default: one per stage; 1 = serial). Results are
+        reported in stage order either way. If the same sources, pins and
+        environment already passed, only the ALWAYS_RUN stages are run
+        again (unless `use_cache` is False).
+        """
+        self._write("\n" + "="*70)
+        self._write("FINAL RELEASE VALIDATION")
+        self._write("="*70 + "\n")
         
-        # Syntax check
-        print("🔍 Syntax Validation...")
-        try:
-            import py_compile
-            py_compile.compile(__file__, doraise=True)
-            self.checks['syntax'] = True
-            print("  ✅ Syntax valid\n")
-        except Exception as e:
-            print(f"  ❌ Syntax error: {e}\n")
-            all_passed = False
+        sentinel = os.path.join(self.SYNTAX_CACHE_DIR, "release-" + self._tree_key() + ".ok")
+        cached = use_cache and os.path.exists(sentinel)
         
-        # Unit tests
-        print("🧪 Running Unit Tests...")
-        try:
-            self._run_unit_tests()
-            self.checks['unit_tests'] = True
-            print("  ✅ All unit tests passed\n")
-        except Exception as e:
-            print(f"  ❌ Unit test failed: {e}\n")
-            all_passed = False
+        def run(method_name: str) -> Optional[Exception]:
+            try:
+                getattr(self, method_name)()
+            except Exception as e:
+                return e
+            return None
         
-        # Security
-        print("🔒 Security Validation...")
-        try:
-            self._run_security_tests()
-            self.checks['security'] = True
-            print("  ✅ Security checks passed\n")
-        except Exception as e:
-            print(f"  ❌ Security check failed: {e}\n")
-            all_passed = False
+        methods = [method for check, _, _, _, method in self.STAGES
+                   if not cached or check in self.ALWAYS_RUN]
+        if jobs == 1 or len(methods) == 1:
+            errors = dict(zip(methods, map(run, methods)))
+        else:
+            with ThreadPoolExecutor(max_workers=jobs or len(methods)) as pool:
+                errors = dict(zip(methods, pool.map(run, methods)))
         
-        # Performance
-        print("⚡ Performance Testing...")
-        try:
-            self._run_performance_tests()
-            self.checks['performance'] = True
-            print("  ✅ Performance acceptable\n")
-        except Exception as e:
-            print(f"  ❌ Performance test failed: {e}\n")
-            all_passed = False
+        all_passed = True
+        for check, banner, ok_msg, fail_msg, method in self.STAGES:
+            self._write(banner)
+            if method not in errors:
+                self.checks[check] = True
+                self._write(f"  ✅ {ok_msg} (cached)\n")
+            elif errors[method] is None:
+                self.checks[check] = True
+                self._write(f"  ✅ {ok_msg}\n")
+            else:
+                self._write(f"  ❌ {fail_msg}: {errors[method]}\n")
+                all_passed = False
         
-        # Integration
-        print("🔗 Integration Testing...")
-        try:
-            self._run_integration_tests()
-            self.checks['integration'] = True
-            print("  ✅ Integration tests passed\n")
-        except Exception as e:
-            print(f"  ❌ Integration test failed: {e}\n")
-            all_passed = False
+        self._code_review()
         
-        # Code review
-        print("📝 Code Review...")
+        if all_passed:
+            self._touch(sentinel)
+        self._flush()
+        return all_passed
+    
+    def _code_review(self):
+        """Run code review"""
+        self._write("📝 Code Review...")
         self.checks['code_review'] = True
-        print("  ✅ Code review passed\n")
+        self._write("  ✅ Code review passed\n")
+    
+    @staticmethod
+    def _project_files() -> List[str]:
+        """The project modules: every .py file next to this one"""
+        project_dir = os.path.dirname(os.path.abspath(__file__))
+        return [os.path.join(project_dir, name)
+                for name in sorted(os.listdir(project_dir)) if name.endswith('.py')]
+    
+    def _tree_key(self) -> str:
+        """Hash of the interpreter, its environment, the pins and every project module"""
+        h = hashlib.blake2b(f"{sys.version}\0{sys.prefix}\0{platform.platform()}".encode(),
+                            digest_size=16)
+        project_dir = os.path.dirname(os.path.abspath(__file__))
+        pins = [os.path.join(project_dir, name) for name in self.ENV_FILES]
+        for path in self._project_files() + [p for p in pins if os.path.exists(p)]:
+            with open(path, 'rb') as f:
+                source = f.read()
+            h.update(f"\0{os.path.basename(path)}\0{len(source)}\0".encode())
+            h.update(source)
+        return h.hexdigest()
+    
+    def _touch(self, sentinel: str):
+        """Record a pass in the cache directory (best effort)"""
+        try:
+            os.makedirs(self.SYNTAX_CACHE_DIR, exist_ok=True)
+            open(sentinel, 'w').close()
+        except OSError:
+            pass  # No writable cache: run again next time
+    
+    def _syntax_check(self):
+        """Compile every project module (the .py files next to this one)
         
-        return all_passed
+        All files are checked in this one process with compile(), which only
+        parses and builds the code object: no per-file py_compile/compileall
+        run, marshalling or .pyc writes. Sources that already compiled
+        cleanly are skipped by content hash.
+        """
+        for path in self._project_files():
+            self._compile_cached(path)
+    
+    def _compile_cached(self, path: str):
+        """compile() one source file, unless this exact source already passed
+        
+        The key covers the interpreter version too: a file that compiles on
+        one Python (e.g. using `match`) may be a syntax error on another.
+        """
+        with open(path, 'rb') as f:
+            source = f.read()
+        h = hashlib.blake2b(sys.version.encode(), digest_size=16)
+        h.update(b"\0")
+        h.update(source)
+        key = h.hexdigest()
+        sentinel = os.path.join(self.SYNTAX_CACHE_DIR, key + ".ok")
+        if os.path.exists(sentinel):
+            return
+        
+        compile(source, path, 'exec')
+        self._touch(sentinel)
     
     def _run_unit_tests(self):
         """Run unit tests"""
-        llm = LLMSummaryGenerator()
         amendment = Amendment("Test", "substantive", "Author")
         node = ChainNode(amendment)
         chain = HashChain("ACT-TEST", "Test")
@@ -464,21 +1254,22 @@ class ReleaseValidator:
     
     def _run_performance_tests(self):
         """Run performance tests"""
-        import time
         chain = HashChain("ACT-PERF", "Performance Test")
+        budget = 1.0  # 100 amendments should complete in < 1 second
         
-        start = time.time()
+        start = time.perf_counter()
         for i in range(100):
             amendment = Amendment(f"Amendment {i}", "substantive", f"Author {i}")
             chain.add_amendment(amendment)
-        elapsed = time.time() - start
-        
-        # Should complete 100 amendments in < 1 second
-        assert elapsed < 1.0, f"Performance too slow: {elapsed}s"
+            
+            # Fail fast: no point finishing the run once over budget
+            if i % 10 == 9:
+                elapsed = time.perf_counter() - start
+                assert elapsed < budget, f"Performance too slow: {elapsed}s after {i + 1} amendments"
     
     def _run_integration_tests(self):
         """Run integration tests"""
-        llm = LLMSummaryGenerator()
+        llm = self._llm
         chain = HashChain("ACT-INT", "Integration Test", llm=llm)
         
         for i in range(3):
@@ -504,156 +1295,204 @@ def release():
     validator = ReleaseValidator()
     
     if validator.validate_all():
-        print("="*70)
-        print("✅ RELEASE APPROVED - READY FOR PRODUCTION")
-        print("="*70)
-        print("\nRelease Details:")
-        print(f"  Version: 1.0.0")
-        print(f"  Timestamp: {datetime.now().isoformat()}")
-        print(f"  Status: ✅ PRODUCTION READY")
-        print(f"  Tests: 21/21 PASSED")
-        print(f"  Security: ✅ PASSED")
-        print(f"  Performance: ✅ ACCEPTABLE")
-        print(f"  Code Quality: ✅ APPROVED")
-        print("\nDeployment Instructions:")
-        print("  1. pip install -r requirements.txt")
-        print("  2. python main.py")
-        print("  3. Open http://localhost:8000/docs")
-        print("\n" + "="*70 + "\n")
+        validator._write("="*70)
+        validator._write("✅ RELEASE APPROVED - READY FOR PRODUCTION")
+        validator._write("="*70)
+        validator._write("\nRelease Details:")
+        validator._write(f"  Version: 1.0.0")
+        validator._write(f"  Timestamp: {datetime.now().isoformat()}")
+        validator._write(f"  Status: ✅ PRODUCTION READY")
+        validator._write(f"  Tests: 21/21 PASSED")
+        validator._write(f"  Security: ✅ PASSED")
+        validator._write(f"  Performance: ✅ ACCEPTABLE")
+        validator._write(f"  Code Quality: ✅ APPROVED")
+        validator._write("\nDeployment Instructions:")
+        validator._write("  1. pip install -r requirements.txt")
+        validator._write("  2. python main.py")
+        validator._write("  3. Open http://localhost:8000/docs")
+        validator._write("\n" + "="*70 + "\n")
+        validator._flush()
         return True
     else:
-        print("="*70)
-        print("❌ RELEASE BLOCKED - PLEASE FIX ISSUES ABOVE")
-        print("="*70 + "\n")
+        validator._write("="*70)
+        validator._write("❌ RELEASE BLOCKED - PLEASE FIX ISSUES ABOVE")
+        validator._write("="*70 + "\n")
+        validator._flush()
         return False
 
 
-if __name__ == "__main__":
-    # Run validation tests from original code
-    print("\n" + "="*70)
-    print("LEGAL ACT TRACKER - PRODUCTION READY")
-    print("="*70)
-    
-    tests_passed = 0
-    tests_total = 0
-    
-    # Test 1: Input validation
-    print("\n✓ Input Validation")
-    tests_total += 1
-    try:
-        try:
-            Amendment("", "substantive", "Author")
-            raise AssertionError("Should reject empty content")
-        except ValueError:
-            pass
-        
-        try:
-            Amendment("Content", "invalid", "Author")
-            raise AssertionError("Should reject invalid type")
-        except ValueError:
-            pass
-        
-        print("  ✓ Passed")
-        tests_passed += 1
-    except Exception as e:
-        print(f"  ✗ Failed: {e}")
-    
-    # Test 2: LLM simplification
-    print("\n✓ LLM Simplification")
-    tests_total += 1
+# ============================================================================
+# SELF-TESTS
+# ============================================================================
+
+def _check_input_validation():
     try:
-        llm = LLMSummaryGenerator()
-        text = "Artykuł 1: Niniejszym ustawą osoby powinni mieć prawo."
-        simplified = llm.simplify(text)
-        assert "muszą" in simplified or "musi" in simplified
-        print("  ✓ Passed")
-        tests_passed += 1
-    except Exception as e:
-        print(f"  ✗ Failed: {e}")
-    
-    # Test 3: Amendment & hashing
-    print("\n✓ Amendment Creation & Hashing")
-    tests_total += 1
+        Amendment("", "substantive", "Author")
+        raise AssertionError("Should reject empty content")
+    except ValueError:
+        pass
+    
     try:
-        llm = LLMSummaryGenerator()
+        Amendment("Content", "invalid", "Author")
+        raise AssertionError("Should reject invalid type")
+    except ValueError:
+        pass
+
+
+def _check_llm_simplification(llm):
+    text = "Artykuł 1: Niniejszym ustawą osoby powinni mieć prawo."
+    simplified = llm.simplify(text)
+    assert "muszą" in simplified or "musi" in simplified
+
+
+def _check_amendment_hashing(llm):
+    amendment = Amendment(
+        "Artykuł 1: Test",
+        "substantive",
+        "Author A",
+        llm=llm
+    )
+    
+    node = ChainNode(amendment)
+    assert len(node.hash) == 64  # SHA-256
+    assert node.verify()
+
+
+def _check_chain_operations(llm):
+    chain = HashChain("ACT-001", "Test Act", llm=llm)
+    
+    for i in range(5):
         amendment = Amendment(
-            "Artykuł 1: Test",
+            f"Amendment {i}",
             "substantive",
-            "Author A",
+            f"Author {i}",
             llm=llm
         )
-        
-        node = ChainNode(amendment)
-        assert len(node.hash) == 64  # SHA-256
-        assert node.verify()
-        
-        print("  ✓ Passed")
-        tests_passed += 1
-    except Exception as e:
-        print(f"  ✗ Failed: {e}")
+        chain.add_amendment(amendment)
     
-    # Test 4: Chain operations
-    print("\n✓ Chain Operations")
-    tests_total += 1
-    try:
-        llm = LLMSummaryGenerator()
-        chain = HashChain("ACT-001", "Test Act", llm=llm)
-        
-        for i in range(5):
-            amendment = Amendment(
-                f"Amendment {i}",
-                "substantive",
-                f"Author {i}",
-                llm=llm
-            )
-            chain.add_amendment(amendment)
-        
-        assert len(chain.chain) == 5
-        history = chain.get_history()
-        assert len(history) == 5
-        assert chain.verify_integrity()
-        
-        print("  ✓ Passed")
-        tests_passed += 1
-    except Exception as e:
-        print(f"  ✗ Failed: {e}")
+    assert len(chain.chain) == 5
+    history = chain.get_history()
+    assert len(history) == 5
+    assert chain.verify_integrity()
+
+
+def _check_tampering_detection(llm):
+    chain = HashChain("ACT-002", "Test Act", llm=llm)
     
-    # Test 5: Tampering detection
-    print("\n✓ Tampering Detection")
-    tests_total += 1
-    try:
-        llm = LLMSummaryGenerator()
-        chain = HashChain("ACT-002", "Test Act", llm=llm)
-        
-        amendment = Amendment("Test", "substantive", "Author", llm=llm)
-        chain.add_amendment(amendment)
+    amendment = Amendment("Test", "substantive", "Author", llm=llm)
+    chain.add_amendment(amendment)
+    
+    # Tamper with data
+    chain.chain[0].amendment.content = "TAMPERED"
+    
+    # Should detect tampering
+    assert not chain.verify_integrity()
+    
+    # An edit that bypasses Amendment.__setattr__ only shows up deep
+    chain.chain[0].amendment.content = "Test"
+    assert chain.verify_integrity()
+    object.__setattr__(amendment, 'content', "TAMPERED")
+    assert not chain.verify_integrity(deep=True)
+
+
+def _check_rate_limiting():
+    limiter = RateLimiter(max_requests=3, window_sec=60)
+    
+    assert limiter.is_allowed("client1")
+    assert limiter.is_allowed("client1")
+    assert limiter.is_allowed("client1")
+    assert not limiter.is_allowed("client1")
+
+
+def _check_reads_follow_edits():
+    chain = HashChain("ACT-003", "Test Act")
+    for i in range(3):
+        chain.add_amendment(Amendment(f"Content {i}", "substantive", f"Author {i}"))
+    assert chain.get_statistics()['by_type']['substantive'] == 3
+    assert chain.get_history()[1]['amendment']['content'] == "Content 1"
+    
+    # Field edit and node replacement after the indexes were built
+    chain.chain[0].amendment.change_type = "editorial"
+    chain.chain[1] = ChainNode(Amendment("Replaced", "substantive", "Mallory"))
+    chain.invalidate_indexes()
+    
+    assert chain.get_statistics()['by_type'] == {'editorial': 1, 'substantive': 2}
+    assert [e['version'] for e in chain.query(change_type="editorial")] == [1]
+    assert [e['version'] for e in chain.query(author="mallory")] == [2]
+    assert not chain.query(author="Author 1")
+    assert [e['version'] for e in chain.search("replaced")] == [2]
+    
+    history = chain.get_history()
+    assert history[0]['amendment']['change_type'] == "editorial"
+    assert history[1] == chain.get_by_version(2)
+    assert history[1]['amendment']['content'] == "Replaced"
+
+
+def _check_merkle_proofs():
+    for size in (3, 5):
+        chain = HashChain("ACT-004", "Test Act")
+        for i in range(size):
+            chain.add_amendment(Amendment(f"Content {i}", "substantive", f"Author {i}"))
+        root = chain.get_merkle_root()
+        assert chain.get_merkle_size() == size
+        assert all(chain.verify_amendment(v) for v in range(1, size + 1))
         
-        # Tamper with data
-        chain.chain[0].amendment.content = "TAMPERED"
+        # Phantom version: the last leaf's proof replayed one past the end,
+        # whether or not the claimed size is stretched to fit
+        last = chain.chain[-1].digest
+        proof = chain.get_inclusion_proof(size)
+        assert not HashChain.verify_inclusion(last, size + 1, proof, root, size)
+        assert not HashChain.verify_inclusion(last, size + 1, proof, root, size + 1)
         
-        # Should detect tampering
-        assert not chain.verify_integrity()
+        # Interior node passed off as a leaf with a shortened proof
+        interior = chain._merkle_levels[1][0]
+        for cut in range(len(proof) + 1):
+            assert not HashChain.verify_inclusion(interior, 1, proof[cut:], root, size)
+            assert not HashChain.verify_inclusion(interior, 1, chain.get_inclusion_proof(1)[cut:], root, size)
         
-        print("  ✓ Passed")
-        tests_passed += 1
-    except Exception as e:
-        print(f"  ✗ Failed: {e}")
+        for version in (0, size + 1):
+            try:
+                chain.verify_amendment(version)
+                raise AssertionError(f"Should reject version {version}")
+            except ValueError:
+                pass
+
+
+# (title, check, takes_llm) rows, run in order by the __main__ block;
+# checks that summarize text are given the shared LLMSummaryGenerator
+SELF_TESTS = (
+    ("Input Validation", _check_input_validation, False),
+    ("LLM Simplification", _check_llm_simplification, True),
+    ("Amendment Creation & Hashing", _check_amendment_hashing, True),
+    ("Chain Operations", _check_chain_operations, True),
+    ("Tampering Detection", _check_tampering_detection, True),
+    ("Rate Limiting", _check_rate_limiting, False),
+    ("Reads Follow Edits", _check_reads_follow_edits, False),
+    ("Merkle Inclusion Proofs", _check_merkle_proofs, False),
+)
+
+
+if __name__ == "__main__":
+    # Run validation tests from original code
+    print("\n" + "="*70)
+    print("LEGAL ACT TRACKER - PRODUCTION READY")
+    print("="*70)
     
-    # Test 6: Rate limiting
-    print("\n✓ Rate Limiting")
-    tests_total += 1
-    try:
-        limiter = RateLimiter(max_requests=3, window_sec=60)
-        
-        assert limiter.is_allowed("client1")
-        assert limiter.is_allowed("client1")
-        assert limiter.is_allowed("client1")
-        assert not limiter.is_allowed("client1")
-        
-        print("  ✓ Passed")
-        tests_passed += 1
-    except Exception as e:
-        print(f"  ✗ Failed: {e}")
+    tests_passed = 0
+    tests_total = len(SELF_TESTS)
+    llm = LLMSummaryGenerator()
+    
+    for title, check, takes_llm in SELF_TESTS:
+        print(f"\n✓ {title}")
+        try:
+            if takes_llm:
+                check(llm)
+            else:
+                check()
+            print("  ✓ Passed")
+            tests_passed += 1
+        except Exception as e:
+            print(f"  ✗ Failed: {e}")
     
     # Summary and release
     print("\n" + "="*70)
@@ -662,13 +1501,10 @@ if __name__ == "__main__":
     if tests_passed == tests_total:
         # Run final release validation
         if release():
-            import sys
             sys.exit(0)
         else:
-            import sys
             sys.exit(1)
     else:
         print("❌ Some tests failed - review above")
         print("="*70 + "\n")
-        import sys
         sys.exit(1)
\ No newline at end of file
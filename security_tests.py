@@ -5,7 +5,10 @@ Comprehensive security validation before production deployment
 
 import hashlib
 import json
-from hash_chain import Amendment, HashChain, LLMSummaryGenerator
+from hash_chain import Amendment, ChainNode, HashChain, LLMSummaryGenerator
+
+# One generator shared by every test (none of them depends on a fresh one)
+_LLM = LLMSummaryGenerator()
 
 print("\n" + "="*70)
 print("SECURITY & PENETRATION TESTING SUITE")
@@ -21,7 +24,7 @@ print("-" * 70)
 # TEST 1.1: SQL Injection attempt
 print("\n✓ TEST 1.1: SQL Injection Protection")
 try:
-    llm = LLMSummaryGenerator()
+    llm = _LLM
     sql_injection = "'; DROP TABLE amendments; --"
     result = llm.simplify(sql_injection)
     assert sql_injection not in result or "DROP TABLE" not in result
@@ -97,21 +100,18 @@ print("-" * 70)
 # TEST 2.1: Hash collision resistance
 print("\n✓ TEST 2.1: Hash Collision Resistance (SHA-256)")
 try:
-    hashes = set()
-    collisions = 0
-    
-    for i in range(1000):
-        amendment = Amendment(
+    digests = [
+        ChainNode(Amendment(
             content=f"Content {i}",
             change_type="substantive",
             author=f"Author {i}"
-        )
-        from hash_chain import ChainNode
-        node = ChainNode(amendment)
-        
-        if node.hash in hashes:
-            collisions += 1
-        hashes.add(node.hash)
+        )).digest
+        for i in range(1000)
+    ]
+    
+    # One bulk set build over the raw 32-byte digests
+    hashes = set(digests)
+    collisions = len(digests) - len(hashes)
     
     assert collisions == 0, f"Found {collisions} collisions!"
     print(f"  ✓ Tested 1000 amendments, 0 collisions found")
@@ -133,7 +133,6 @@ try:
         author="Author2"
     )
     
-    from hash_chain import ChainNode
     node1 = ChainNode(amendment1)
     node2 = ChainNode(amendment2)
     
@@ -155,7 +154,6 @@ try:
             change_type="substantive",
             author="Test"
         )
-        from hash_chain import ChainNode
         node = ChainNode(amendment)
         
         if node.hash == target_hash:
@@ -177,11 +175,11 @@ print("-" * 70)
 # TEST 3.1: Middle amendment tampering detection
 print("\n✓ TEST 3.1: Middle Amendment Tampering Detection")
 try:
-    llm = LLMSummaryGenerator()
-    chain = HashChain("ACT-001", "Test Act", llm_generator=llm)
+    llm = _LLM
+    chain = HashChain("ACT-001", "Test Act", llm=llm)
     
     amendments = [
-        Amendment(f"Content {i}", "substantive", f"Author {i}", llm_generator=llm)
+        Amendment(f"Content {i}", "substantive", f"Author {i}", llm=llm)
         for i in range(5)
     ]
     
@@ -201,14 +199,14 @@ except Exception as e:
 # TEST 3.2: Hash manipulation detection
 print("\n✓ TEST 3.2: Hash Manipulation Detection")
 try:
-    llm = LLMSummaryGenerator()
-    chain = HashChain("ACT-002", "Test Act", llm_generator=llm)
+    llm = _LLM
+    chain = HashChain("ACT-002", "Test Act", llm=llm)
     
-    amendment = Amendment("Content", "substantive", "Author", llm_generator=llm)
+    amendment = Amendment("Content", "substantive", "Author", llm=llm)
     chain.add_amendment(amendment)
     
     # Manually change stored hash
-    chain.chain[0].hash = "fake_hash_" + chain.chain[0].hash[10:]
+    chain.chain[0].digest = b"fake_hash_" + chain.chain[0].digest[10:]
     
     # Verify should fail
     is_valid = chain.verify_integrity()
@@ -220,17 +218,17 @@ except Exception as e:
 # TEST 3.3: Parent link tampering
 print("\n✓ TEST 3.3: Parent Link Tampering Detection")
 try:
-    llm = LLMSummaryGenerator()
-    chain = HashChain("ACT-003", "Test Act", llm_generator=llm)
+    llm = _LLM
+    chain = HashChain("ACT-003", "Test Act", llm=llm)
     
-    amendment1 = Amendment("Content 1", "substantive", "Author 1", llm_generator=llm)
-    amendment2 = Amendment("Content 2", "substantive", "Author 2", llm_generator=llm)
+    amendment1 = Amendment("Content 1", "substantive", "Author 1", llm=llm)
+    amendment2 = Amendment("Content 2", "substantive", "Author 2", llm=llm)
     
     chain.add_amendment(amendment1)
     chain.add_amendment(amendment2)
     
     # Tamper with parent link
-    chain.chain[1].parent_hash = "fake_parent_hash"
+    chain.chain[1].parent_digest = b"fake_parent_hash"
     
     # Verify should fail
     is_valid = chain.verify_integrity()
@@ -242,18 +240,17 @@ except Exception as e:
 # TEST 3.4: Amendment insertion attack
 print("\n✓ TEST 3.4: Amendment Insertion Attack Detection")
 try:
-    llm = LLMSummaryGenerator()
-    chain = HashChain("ACT-004", "Test Act", llm_generator=llm)
+    llm = _LLM
+    chain = HashChain("ACT-004", "Test Act", llm=llm)
     
-    amendment1 = Amendment("Content 1", "substantive", "Author 1", llm_generator=llm)
-    amendment3 = Amendment("Content 3", "substantive", "Author 3", llm_generator=llm)
+    amendment1 = Amendment("Content 1", "substantive", "Author 1", llm=llm)
+    amendment3 = Amendment("Content 3", "substantive", "Author 3", llm=llm)
     
     chain.add_amendment(amendment1)
     chain.add_amendment(amendment3)
     
     # Try to insert amendment in middle
-    from hash_chain import ChainNode
-    fake_amendment2 = Amendment("INSERTED CONTENT", "substantive", "Attacker", llm_generator=llm)
+    fake_amendment2 = Amendment("INSERTED CONTENT", "substantive", "Attacker", llm=llm)
     fake_node = ChainNode(fake_amendment2, parent_hash=chain.chain[0].hash)
     chain.chain.insert(1, fake_node)
     
@@ -288,24 +285,25 @@ except Exception as e:
 print("\n✓ TEST 4.2: Large Chain Performance Test")
 try:
     import time
-    llm = LLMSummaryGenerator()
-    chain = HashChain("ACT-PERF", "Performance Test", llm_generator=llm)
+    llm = _LLM
+    chain = HashChain("ACT-PERF", "Performance Test", llm=llm)
     
-    start = time.time()
+    start = time.perf_counter_ns()
     
+    add = chain.add_amendment
     for i in range(100):
-        amendment = Amendment(
+        add(Amendment(
             content=f"Amendment {i}",
             change_type="substantive",
             author=f"Author {i}",
             summary=f"Summary {i}"
-        )
-        chain.add_amendment(amendment)
+        ))
     
-    elapsed = time.time() - start
+    elapsed_ns = time.perf_counter_ns() - start
     
-    print(f"  ✓ Added 100 amendments in {elapsed:.2f} seconds")
-    print(f"  ✓ Average per amendment: {(elapsed/100)*1000:.2f} ms")
+    # The loop takes milliseconds, below what seconds can usefully show
+    print(f"  ✓ Added 100 amendments in {elapsed_ns / 1e6:.2f} ms")
+    print(f"  ✓ Average per amendment: {elapsed_ns / 100 / 1000:.2f} µs")
     
     # Verify chain
     is_valid = chain.verify_integrity()
@@ -316,9 +314,14 @@ except Exception as e:
 # TEST 4.3: Memory limit check
 print("\n✓ TEST 4.3: Memory Efficiency Check")
 try:
-    import sys
-    llm = LLMSummaryGenerator()
-    chain = HashChain("ACT-MEM", "Memory Test", llm_generator=llm)
+    import tracemalloc
+    llm = _LLM
+    
+    chain = HashChain("ACT-MEM", "Memory Test", llm=llm)
+    
+    # Measure everything the amendments allocate, not just the outer object
+    # (sys.getsizeof(chain) is a shallow, fixed-size slots instance)
+    tracemalloc.start()
     
     for i in range(50):
         amendment = Amendment(
@@ -328,8 +331,8 @@ try:
         )
         chain.add_amendment(amendment)
     
-    # Rough memory estimate
-    size_bytes = sys.getsizeof(chain)
+    size_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
     print(f"  ✓ Chain with 50 amendments: ~{size_bytes / 1024:.2f} KB")
 except Exception as e:
     print(f"  ✗ FAILED: {e}")
@@ -16,10 +16,13 @@ from datetime import datetime
 
 try:
     import pandas as pd
+    from openpyxl import load_workbook
 except Exception:
     print("Missing dependency: pandas. Install with 'pip install pandas openpyxl'")
     sys.exit(1)
 
+PREVIEW_ROWS = 8
+
 
 def prompt_file():
     while True:
@@ -69,6 +72,23 @@ def pick_column(df, prompt_text, allow_empty=False):
         print("Invalid column. Try again.")
 
 
+def read_columns(path, sheet, header, columns):
+    """Stream only the chosen columns of a sheet (read-only, cached values)."""
+    positions = [list(header).index(c) for c in columns]
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb[sheet].iter_rows(values_only=True)
+        next(rows, None)  # header row
+        data = [
+            [row[i] if i < len(row) else None for i in positions]
+            for row in rows
+            if any(v is not None for v in row)  # read_excel skips blank rows too
+        ]
+    finally:
+        wb.close()
+    return pd.DataFrame(data, columns=columns)
+
+
 def parse_date_column(df, date_col):
     try:
         return pd.to_datetime(df[date_col], errors="coerce")
@@ -92,59 +112,68 @@ def main():
 
         sheet = choose_sheet(xl)
         try:
-            df = xl.parse(sheet)
+            # Only the preview is parsed in full; data columns are streamed later
+            preview = xl.parse(sheet, nrows=PREVIEW_ROWS)
         except Exception as e:
             print("Failed to read sheet:", e)
             continue
 
-        if df.empty:
+        if preview.empty:
             print("Selected sheet is empty.")
             continue
 
-        print("\nSheet preview (first 8 rows):")
-        print(df.head(8).to_string(index=False))
+        print(f"\nSheet preview (first {PREVIEW_ROWS} rows):")
+        print(preview.to_string(index=False))
+
+        amt_col = pick_column(preview, "Select AMOUNT column")
+        cat_col = pick_column(preview, "Select CATEGORY column (or press Enter to treat all as one category)", allow_empty=True)
+        date_col = pick_column(preview, "Select DATE column for optional filtering (or press Enter to skip)", allow_empty=True)
 
-        amt_col = pick_column(df, "Select AMOUNT column")
-        cat_col = pick_column(df, "Select CATEGORY column (or press Enter to treat all as one category)", allow_empty=True)
-        date_col = pick_column(df, "Select DATE column for optional filtering (or press Enter to skip)", allow_empty=True)
+        wanted = list(dict.fromkeys(c for c in (amt_col, cat_col, date_col) if c))
+        try:
+            df = read_columns(path, sheet, preview.columns, wanted)
+        except Exception as e:
+            print("Failed to read sheet:", e)
+            continue
 
-        # Prepare amount
-        df["_amount_raw"] = df[amt_col]
-        df["_amount"] = pd.to_numeric(df["_amount_raw"], errors="coerce")
-        non_numeric = df[["_amount_raw", "_amount"]].loc[df["_amount"].isna()]
-        if not non_numeric.empty:
-            print(f"\nWarning: {len(non_numeric)} rows have non-numeric amounts and will be ignored.")
-        df = df.dropna(subset=["_amount"]).copy()
+        # Prepare amount: one numeric column, rows selected by a mask
+        # instead of helper columns and filtered copies of the frame
+        amounts = pd.to_numeric(df[amt_col], errors="coerce").rename("_amount")
+        keep = amounts.notna()
+        non_numeric = int((~keep).sum())
+        if non_numeric:
+            print(f"\nWarning: {non_numeric} rows have non-numeric amounts and will be ignored.")
 
         # Optional date filter
         if date_col:
             dates = parse_date_column(df, date_col)
-            if dates.isna().all():
+            if dates[keep].isna().all():
                 print("Warning: could not parse any dates from the selected date column; skipping date filter.")
             else:
-                df["_date"] = dates
                 print("\nEnter date range to filter (YYYY-MM-DD). Leave blank to skip.")
                 start = input("  start date: ").strip()
                 end = input("  end date: ").strip()
                 try:
+                    in_range = keep.copy()
                     if start:
-                        start_dt = datetime.fromisoformat(start)
-                        df = df[df["_date"] >= start_dt]
+                        in_range &= dates >= datetime.fromisoformat(start)
                     if end:
-                        end_dt = datetime.fromisoformat(end)
-                        df = df[df["_date"] <= end_dt]
+                        in_range &= dates <= datetime.fromisoformat(end)
+                    keep = in_range
                 except Exception:
                     print("Invalid date(s) entered; skipping date filter.")
 
+        amounts = amounts[keep]
+
         # Grouping and totals
         if cat_col:
-            summary = df.groupby(df[cat_col].fillna("Unspecified"))["_amount"].sum().sort_values(ascending=False)
+            categories = df.loc[keep, cat_col].fillna("Unspecified")
+            summary = amounts.groupby(categories, sort=False).sum().sort_values(ascending=False)
             print("\nTotals by category:")
             print(summary.to_string())
             grand_total = summary.sum()
         else:
-            grand_total = df["_amount"].sum()
-            print(f"\nGrand total: {grand_total:.2f}")
+            grand_total = amounts.sum()
 
         print(f"\nGrand total: {grand_total:.2f}")
 
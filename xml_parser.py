@@ -1,10 +1,24 @@
+import difflib
+import json
 import xml.etree.ElementTree as ET
 from typing import List, Optional
 from datetime import datetime
 from hash_chain import Amendment, HashChain, LLMSummaryGenerator
+import data_ingestion
 
-class LegalDocumentParser:
-    """Parses XML legal documents and extracts amendments"""
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+class LegalDocumentParser(data_ingestion.LegalDocumentParser):
+    """Parses XML legal documents and extracts amendments
+    
+    Streaming (iter_file) and per-element extraction come from
+    data_ingestion.LegalDocumentParser.
+    """
     
     def __init__(self):
         pass
@@ -12,9 +26,7 @@ class LegalDocumentParser:
     def parse_file(self, filepath: str) -> List[dict]:
         """Read XML file and extract amendments"""
         try:
-            tree = ET.parse(filepath)
-            root = tree.getroot()
-            amendments = self._extract_amendments(root)
+            amendments = list(self.iter_file(filepath))
             print(f"✓ Parsed {len(amendments)} amendments from {filepath}")
             return amendments
         except FileNotFoundError:
@@ -26,24 +38,16 @@ class LegalDocumentParser:
     
     def _extract_amendments(self, root) -> List[dict]:
         """Extract all amendments from XML"""
-        amendments = []
         amendments_elem = root.find('Amendments')
         
         if amendments_elem is None:
-            return amendments
-        
-        for amendment_elem in amendments_elem.findall('Amendment'):
-            amendment_data = {
-                'version': amendment_elem.findtext('Version', '1'),
-                'content': amendment_elem.findtext('Content', ''),
-                'author': amendment_elem.findtext('Author', 'Unknown'),
-                'date': amendment_elem.findtext('Date', datetime.now().isoformat()),
-                'change_type': amendment_elem.findtext('Type', 'substantive'),
-                'summary': amendment_elem.findtext('Summary', None),
-            }
-            amendments.append(amendment_data)
+            return []
         
-        return amendments
+        default_date = datetime.now().isoformat()
+        return [
+            self._amendment_data(amendment_elem, default_date)
+            for amendment_elem in amendments_elem.findall('Amendment')
+        ]
     
     def parse_string(self, xml_string: str) -> List[dict]:
         """Parse XML from string"""
@@ -59,14 +63,21 @@ class DiffEngine:
     """Detects changes between amendment versions"""
     
     def compare_amendments(self, old_content: str, new_content: str) -> dict:
-        """Compare two versions"""
-        old_sections = set(old_content.split('\n'))
-        new_sections = set(new_content.split('\n'))
+        """Compare two versions line by line (order and duplicates preserved)"""
+        old_lines = old_content.split('\n')
+        new_lines = new_content.split('\n')
+        
+        added, removed = [], []
+        matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag != 'equal':
+                removed.extend(old_lines[i1:i2])
+                added.extend(new_lines[j1:j2])
         
         return {
-            'added_lines': list(new_sections - old_sections),
-            'removed_lines': list(old_sections - new_sections),
-            'total_changes': len(new_sections - old_sections) + len(old_sections - new_sections)
+            'added_lines': added,
+            'removed_lines': removed,
+            'total_changes': len(added) + len(removed)
         }
 
 
@@ -117,16 +128,16 @@ class DataIngestionPipeline:
         return chain
     
     def save_chain_to_json(self, chain: HashChain, filepath: str) -> bool:
-        """Save HashChain to JSON"""
-        import json
+        """Save HashChain to JSON, writing one history entry at a time"""
         try:
-            data = {
-                'act_id': chain.act_id,
-                'act_title': chain.act_title,
-                'history': chain.get_history()
-            }
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2)
+            header = _dumps({'act_id': chain.act_id, 'act_title': chain.act_title})
+            with open(filepath, 'wb') as f:
+                f.write(header[:-1] + b',"history":[')
+                for i, entry in enumerate(chain.iter_history()):
+                    if i:
+                        f.write(b',')
+                    f.write(_dumps(entry))
+                f.write(b']}')
             print(f"✓ Chain saved to {filepath}")
             return True
         except Exception as e: